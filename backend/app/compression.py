@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import os
+import zlib
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.entry import Entries
+
+# "zlib" stores new entry content compressed; "none" keeps plain text.
+# Reads understand both formats whatever the setting.
+ENTRY_COMPRESSION = os.getenv("ENTRY_COMPRESSION", "none")
+ENTRY_COMPRESSION_MIN_CHARS = int(os.getenv("ENTRY_COMPRESSION_MIN_CHARS", "256"))
+ENTRY_COMPRESSION_LEVEL = int(os.getenv("ENTRY_COMPRESSION_LEVEL", "6"))
+# Compress rows written before compression was turned on, in the background
+ENTRY_COMPRESSION_BACKFILL = os.getenv("ENTRY_COMPRESSION_BACKFILL", "1") == "1"
+ENTRY_COMPRESSION_BATCH = int(os.getenv("ENTRY_COMPRESSION_BATCH", "500"))
+
+ZLIB = "zlib"
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def compressContent(text: str) -> tuple[str, bytes | None, str | None]:
+    """
+    Values for (content, content_z, compression) of a row holding `text`.
+    Short texts stay plain: zlib's header would eat the gain.
+    """
+    if ENTRY_COMPRESSION != ZLIB or len(text) < ENTRY_COMPRESSION_MIN_CHARS:
+        return text, None, None
+    return "", zlib.compress(text.encode(), ENTRY_COMPRESSION_LEVEL), ZLIB
+
+
+def decompressContent(
+    content: str, content_z: bytes | None, compression: str | None
+) -> str:
+    if compression is None:
+        return content
+    if compression == ZLIB:
+        return zlib.decompress(content_z).decode()
+    raise ValueError(f"Unknown entry compression: {compression}")
+
+
+def compressRows(rows) -> list[tuple[int, tuple[str, bytes | None, str | None]]]:
+    return [(row.id, compressContent(row.content)) for row in rows]
+
+
+async def compressBacklog(sessionmaker: async_sessionmaker[AsyncSession]) -> int:
+    """
+    Compresses plain rows in ENTRY_COMPRESSION_BATCH batches, each its own
+    short transaction, yielding to the event loop in between. Safe to run in
+    every worker at once on PostgreSQL: rows are claimed with SKIP LOCKED.
+    Returns the number of rows compressed.
+    """
+    if ENTRY_COMPRESSION != ZLIB:
+        return 0
+
+    done = 0
+    while True:
+        async with sessionmaker() as session:
+            query = (
+                select(Entries.id, Entries.content)
+                .where(
+                    Entries.compression.is_(None),
+                    Entries.chunk_count == 0,
+                    func.char_length(Entries.content) >= ENTRY_COMPRESSION_MIN_CHARS,
+                )
+                .limit(ENTRY_COMPRESSION_BATCH)
+            )
+            if session.bind.dialect.name == "postgresql":
+                query = query.with_for_update(skip_locked=True)
+            rows = (await session.execute(query)).all()
+            if not rows:
+                return done
+
+            packed = await asyncio.to_thread(compressRows, rows)
+            # ORM bulk UPDATE by primary key: one executemany per batch
+            await session.execute(
+                update(Entries),
+                [
+                    {
+                        "id": entry_id,
+                        "content": content,
+                        "content_z": content_z,
+                        "compression": compression,
+                    }
+                    for entry_id, (content, content_z, compression) in packed
+                ],
+            )
+            await session.commit()
+            done += len(rows)
+        await asyncio.sleep(0)
+
+
+async def runCompressionBackfill(sessionmaker: async_sessionmaker[AsyncSession]):
+    try:
+        compressed = await compressBacklog(sessionmaker)
+        if compressed:
+            logger.info("Compressed %s existing entries", compressed)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception("Entry compression backfill failed")
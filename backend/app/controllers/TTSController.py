@@ -1,12 +1,167 @@
-import edge_tts
-import uuid
-from pathlib import Path
+import asyncio
+import logging
+import os
+import time
+from contextlib import aclosing
+from typing import AsyncIterator
 
+from app.metrics import (
+    tts_synthesis_bytes,
+    tts_synthesis_duration,
+    tts_synthesis_failures,
+)
+from app.tts.cache import AudioCache, cache_key
+from app.tts.chunking import split_text
+from app.tts.engines import create_tts_engine
+from app.tts.singleflight import SingleFlight
+from app.tts.store import EntryAudioStore
 
-async def speak(text: str, voice: str) -> str:
-    out_path = Path(f"/tmp/{uuid.uuid4()}.mp3")
+SYNTHESIS_CHUNK_CHARS = int(os.getenv("SYNTHESIS_CHUNK_CHARS", "1500"))
+SYNTHESIS_CONCURRENCY = int(os.getenv("SYNTHESIS_CONCURRENCY", "4"))
+DEFAULT_VOICE = os.getenv("DEFAULT_VOICE", "en-US-EmmaMultilingualNeural")
+DEFAULT_RATE = "+0%"
 
-    communicate = edge_tts.Communicate(text, voice, rate="+0%")
-    await communicate.save(str(out_path))
+logger = logging.getLogger("uvicorn.error")
 
-    return str(out_path)
+tts_engine = create_tts_engine()
+
+# Concurrent requests for the same audio share one upstream render
+flights = SingleFlight()
+
+
+def strip_id3(data: bytes) -> bytes:
+    # An ID3v2 header in the middle of a stitched stream is heard as a click
+    if data[:3] != b"ID3" or len(data) < 10:
+        return data
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    return data[10 + size :]
+
+
+def engine_stream(text: str, voice: str, rate: str) -> AsyncIterator[bytes]:
+    return tts_engine.stream(text, voice, rate)
+
+
+async def render_chunk(text: str, voice: str, rate: str) -> bytes:
+    audio = bytearray()
+    async with aclosing(engine_stream(text, voice, rate)) as chunks:
+        async for data in chunks:
+            audio += data
+    return strip_id3(bytes(audio))
+
+
+async def stream(text: str, voice: str, rate: str = "+0%") -> AsyncIterator[bytes]:
+    """
+    Yields MP3 bytes as the engine produces them. Closing the generator (e.g.
+    when the client disconnects) closes the upstream session with it.
+
+    Long texts are split at sentence/paragraph boundaries and rendered with up
+    to SYNTHESIS_CONCURRENCY chunks in flight; MP3 frames are emitted in
+    order, so the whole takes about as long as the slowest chunk.
+    """
+    parts = split_text(text, SYNTHESIS_CHUNK_CHARS) or [text]
+    if len(parts) == 1:
+        async with aclosing(engine_stream(parts[0], voice, rate)) as chunks:
+            async for data in chunks:
+                yield data
+        return
+
+    limit = asyncio.Semaphore(SYNTHESIS_CONCURRENCY)
+
+    async def render_part(part: str) -> bytes:
+        async with limit:
+            return await render_chunk(part, voice, rate)
+
+    tasks = [asyncio.create_task(render_part(part)) for part in parts]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def open_stream(
+    text: str, voice: str, rate: str = "+0%"
+) -> AsyncIterator[bytes]:
+    """
+    Starts `stream` and waits for the first chunk, so upstream failures (bad
+    voice, service down) surface before any response headers are sent.
+    """
+    chunks = stream(text, voice, rate)
+    try:
+        first = await anext(chunks)
+    except BaseException:
+        await chunks.aclose()
+        raise
+
+    async def forward() -> AsyncIterator[bytes]:
+        async with aclosing(chunks):
+            yield first
+            async for data in chunks:
+                yield data
+
+    return forward()
+
+
+async def render(text: str, voice: str, rate: str) -> bytes:
+    audio = bytearray()
+    started = time.perf_counter()
+    try:
+        async with aclosing(stream(text, voice, rate)) as chunks:
+            async for data in chunks:
+                audio += data
+    except Exception:
+        tts_synthesis_failures.inc()
+        raise
+    tts_synthesis_duration.observe(time.perf_counter() - started)
+    tts_synthesis_bytes.inc(amount=len(audio))
+    return bytes(audio)
+
+
+async def speak(
+    text: str, voice: str, cache: AudioCache, rate: str = "+0%"
+) -> tuple[str, bool]:
+    """
+    Returns the cache key of the rendered MP3 (its blob in `cache.store`) and
+    whether it came from the cache.
+    """
+    key = cache_key(text, voice, rate)
+
+    if cache.get(key) is not None:
+        return key, True
+
+    async def render_to_cache() -> None:
+        audio = await render(text, voice, rate)
+        await asyncio.to_thread(cache.put, key, audio)
+
+    await flights.do(("cache", key), render_to_cache)
+
+    return key, False
+
+
+async def render_entry(
+    entry_id: int,
+    text: str,
+    store: EntryAudioStore,
+    voice: str = DEFAULT_VOICE,
+    rate: str = DEFAULT_RATE,
+) -> str:
+    """Renders into the entry audio store and returns the blob key."""
+
+    async def render_to_store() -> str:
+        audio = await render(text, voice, rate)
+        return await asyncio.to_thread(store.put, entry_id, voice, rate, audio)
+
+    # The upload pre-render and a first playback often overlap
+    return await flights.do(("entry", entry_id, voice, rate), render_to_store)
+
+
+async def prerender_entry(entry_id: int, text: str, store: EntryAudioStore) -> None:
+    # Runs as a background task after upload, failures only cost a later render
+    try:
+        await render_entry(entry_id, text, store)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.exception("Pre-render of entry %s failed", entry_id)
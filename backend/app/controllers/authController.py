@@ -5,7 +5,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..db import get_session
 from ..models.user import Users
 from ..schemas.authSchemas import RegisterIn, LoginIn
-from ..security import hash_password, verify_password, create_access_token
+from ..security import (
+    create_access_token,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
 
 
 async def register(data: RegisterIn, session: AsyncSession) -> Users:
@@ -14,10 +19,9 @@ async def register(data: RegisterIn, session: AsyncSession) -> Users:
     ).scalar_one_or_none()
     if exists:
         raise HTTPException(status_code=409, detail="Username already present")
+    hashed = await hash_password_async(data.password)
     try:
-        user = Users(
-            username=data.username, hashed_password=hash_password(data.password)
-        )
+        user = Users(username=data.username, hashed_password=hashed)
         session.add(user)
         await session.commit()
         await session.refresh(user)
@@ -31,9 +35,16 @@ async def login(data: LoginIn, session: AsyncSession):
     user = (
         await session.execute(select(Users).where(Users.username == data.username))
     ).scalar_one_or_none()
-    if not user or not verify_password(data.password, user.hashed_password):
+    if not user or not await verify_password_async(
+        data.password, user.hashed_password
+    ):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    # BCRYPT_ROUNDS changed since this hash was made: upgrade it transparently
+    if needs_rehash(user.hashed_password):
+        user.hashed_password = await hash_password_async(data.password)
+        await session.commit()
+
     if user.username and user.id:
         token = create_access_token(user.id, user.username)
         return token
@@ -1,45 +1,198 @@
+import asyncio
+import base64
+import codecs
+import io
+import json
+import os
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator
+
 from fastapi import HTTPException
-from sqlalchemy import Delete, Select, select
+from pydantic import ValidationError
+from sqlalchemy import (
+    ARRAY,
+    Delete,
+    String,
+    Text,
+    bindparam,
+    case,
+    func,
+    insert,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio.session import AsyncSession
 
+from app.compression import compressContent, decompressContent
+from app.etag import make_etag
+from app.controllers import TTSController
+from app.models.chunk import EntryChunks
 from app.models.entry import Entries
+from app.models.search import AppendSearchText, SearchVector, search_config
 from app.models.user import Users
+from app.userCache import CurrentUser
 from app.schemas.entriesSchemas import (
-    EntrySummary,
+    BulkLineError,
+    BulkUploadOut,
+    EntryOut,
+    ListEntriesOut,
+    SearchEntriesOut,
+    SearchResult,
+    UploadDocumentOut,
     UploadTextIn,
 )
+from app.tts.store import EntryAudioStore
+
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "1000"))
+BULK_MAX_LINE_BYTES = int(os.getenv("BULK_MAX_LINE_BYTES", str(128 * 1024)))
+BULK_MAX_ERRORS = 100
+
+DOCUMENT_CHUNK_CHARS = int(os.getenv("DOCUMENT_CHUNK_CHARS", "8000"))
+DOCUMENT_MAX_BYTES = int(os.getenv("DOCUMENT_MAX_BYTES", str(50 * 1024 * 1024)))
+# Chunk rows buffered before each INSERT while a document streams in
+DOCUMENT_INSERT_BATCH = 16
+
+# Rows per server-side cursor fetch during an export
+EXPORT_FETCH_SIZE = int(os.getenv("EXPORT_FETCH_SIZE", "500"))
+# Bytes per read when copying stored audio into an export archive
+EXPORT_AUDIO_READ = 1024 * 1024
+
+# One INSERT executed per row of a batch (executemany, which asyncpg sends as a
+# single prepared statement); the search document is built in SQL from the
+# same params
+BULK_INSERT = insert(Entries.__table__).values(
+    user_id=bindparam("bulk_user_id"),
+    title=bindparam("bulk_title"),
+    # Compressed rows keep content empty; bulk_content is always the text
+    content=case(
+        (
+            bindparam("bulk_compression", type_=String).is_(None),
+            bindparam("bulk_content", type_=Text),
+        ),
+        else_="",
+    ),
+    content_z=bindparam("bulk_content_z"),
+    compression=bindparam("bulk_compression"),
+    search_vector=SearchVector(bindparam("bulk_title"), bindparam("bulk_content")),
+)
+
+
+USERS = Users.__table__
+
+
+async def bumpLibraryVersion(session: AsyncSession, user_id: int) -> None:
+    """
+    Invalidates the user's listing ETag; call inside the transaction that
+    adds or removes entries. A Core UPDATE, so the user cache is left alone.
+    """
+    await session.execute(
+        update(USERS)
+        .where(USERS.c.id == user_id)
+        .values(library_version=USERS.c.library_version + 1)
+    )
+
+
+async def libraryVersion(session: AsyncSession, user_id: int) -> int:
+    # Always from the database: the authenticated user may be a cached snapshot
+    return (
+        await session.execute(
+            select(USERS.c.library_version).where(USERS.c.id == user_id)
+        )
+    ).scalar_one()
+
+
+def entryETag(entry_id: int, version: int) -> str:
+    return make_etag("entry", entry_id, version)
+
+
+def listingETag(user_id: int, library_version: int, limit: int, cursor) -> str:
+    return make_etag("list", user_id, library_version, limit, cursor)
+
+
+async def entryVersion(
+    entry_id: int, current_user: CurrentUser, session: AsyncSession
+) -> int:
+    version = (
+        await session.execute(
+            select(Entries.version).where(
+                Entries.id == entry_id, Entries.user_id == current_user.id
+            )
+        )
+    ).scalar_one_or_none()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    return version
 
 
 async def getEntryById(
     entry_id: int,
-    current_user: Users,
+    current_user: CurrentUser,
     session: AsyncSession,
-) -> Entries:
+) -> EntryOut:
     try:
-        entry = (
+        # Only the columns EntryOut needs: no search_vector, no ORM identity
+        row = (
             await session.execute(
-                Select(Entries)
+                select(
+                    Entries.id,
+                    Entries.user_id,
+                    Entries.title,
+                    Entries.content,
+                    Entries.content_z,
+                    Entries.compression,
+                    Entries.created_at,
+                    Entries.chunk_count,
+                    Entries.length,
+                    Entries.version,
+                )
                 .where(Entries.id == entry_id)
                 .where(Entries.user_id == current_user.id)
             )
-        ).scalar_one()
+        ).one_or_none()
+        if row is None:
+            raise HTTPException(status_code=404, detail="Entry not found")
 
-        return entry
+        return EntryOut(
+            id=row.id,
+            user_id=row.user_id,
+            title=row.title,
+            content=decompressContent(row.content, row.content_z, row.compression),
+            created_at=row.created_at,
+            chunk_count=row.chunk_count,
+            length=row.length,
+            version=row.version,
+        )
     except Exception:
         raise
 
 
+def defaultTitle(data: UploadTextIn) -> str:
+    if data.title == "":
+        return " ".join(data.content.split()[:3])
+    return data.title
+
+
 async def uploadText(
-    data: UploadTextIn, current_user: Users, session: AsyncSession
+    data: UploadTextIn, current_user: CurrentUser, session: AsyncSession
 ) -> Entries:
-    if data.title == "":
-        data.title = " ".join(data.content.split()[:3])
+    data.title = defaultTitle(data)
 
     try:
         # Take the title and text content and save it on database in the correct table with the correct user
-        entry = Entries(title=data.title, user_id=current_user.id, content=data.content)
+        content, content_z, compression = compressContent(data.content)
+        entry = Entries(
+            title=data.title,
+            user_id=current_user.id,
+            content=content,
+            content_z=content_z,
+            compression=compression,
+            search_vector=SearchVector(data.title, data.content),
+        )
 
         session.add(entry)
+        await bumpLibraryVersion(session, current_user.id)
         await session.commit()
         return entry
     except Exception:
@@ -47,35 +200,616 @@ async def uploadText(
         raise
 
 
-async def listEntries(current_user: Users, session: AsyncSession) -> list[EntrySummary]:
+async def iterLines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes | None]:
+    """
+    Splits a streamed body into lines without holding more than one line in
+    memory. A line longer than BULK_MAX_LINE_BYTES is yielded as None.
+    """
+    buffer = bytearray()
+    overflow = False
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            # Measured before copying, so an over-long line is never buffered
+            # whole, whether it spans chunks or sits inside a single one
+            if overflow or len(buffer) + (end - start) > BULK_MAX_LINE_BYTES:
+                yield None
+            else:
+                buffer += chunk[start:end]
+                yield bytes(buffer)
+            buffer.clear()
+            overflow = False
+            start = end + 1
+        if not overflow:
+            if len(buffer) + (len(chunk) - start) > BULK_MAX_LINE_BYTES:
+                buffer.clear()
+                overflow = True
+            else:
+                buffer += chunk[start:]
+    if overflow:
+        yield None
+    elif buffer:
+        yield bytes(buffer)
+
+
+async def bulkUpload(
+    chunks: AsyncIterator[bytes], current_user: CurrentUser, session: AsyncSession
+) -> BulkUploadOut:
+    """
+    Imports NDJSON, one UploadTextIn object per line. Valid lines are inserted
+    with one executemany, one transaction per BULK_BATCH_SIZE rows; invalid
+    lines are skipped and reported by line number.
+    """
+    inserted = failed = 0
+    errors: list[BulkLineError] = []
+    batch: list[dict] = []
+
+    def reject(line: int, error: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < BULK_MAX_ERRORS:
+            errors.append(BulkLineError(line=line, error=error))
+
+    async def flush() -> None:
+        nonlocal inserted
+        try:
+            await session.execute(BULK_INSERT, batch)
+            await bumpLibraryVersion(session, current_user.id)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        inserted += len(batch)
+        batch.clear()
+
+    line = 0
+    async for raw in iterLines(chunks):
+        line += 1
+        if raw is None:
+            reject(line, "Line too long")
+            continue
+        if not raw.strip():
+            continue
+        try:
+            data = UploadTextIn.model_validate_json(raw)
+        except ValidationError as err:
+            first = err.errors()[0]
+            where = ".".join(str(part) for part in first["loc"])
+            reject(line, f"{where}: {first['msg']}" if where else first["msg"])
+            continue
+
+        _, content_z, compression = compressContent(data.content)
+        batch.append(
+            {
+                "bulk_user_id": current_user.id,
+                "bulk_title": defaultTitle(data),
+                "bulk_content": data.content,
+                "bulk_content_z": content_z,
+                "bulk_compression": compression,
+            }
+        )
+        if len(batch) >= BULK_BATCH_SIZE:
+            await flush()
+
+    if batch:
+        await flush()
+
+    return BulkUploadOut(inserted=inserted, failed=failed, errors=errors)
+
+
+async def uploadDocument(
+    title: str,
+    chunks: AsyncIterator[bytes],
+    current_user: CurrentUser,
+    session: AsyncSession,
+) -> UploadDocumentOut:
+    """
+    Stores a UTF-8 text of up to DOCUMENT_MAX_BYTES as ordered
+    DOCUMENT_CHUNK_CHARS-character rows in entry_chunks. The body is decoded
+    and written as it arrives, so at most a few chunks are ever in memory;
+    the whole document is one transaction. Each batch of chunks is also
+    appended to the entry's search document.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = unindexed = ""
+    rows: list[dict] = []
+    received = seq = length = 0
+
     try:
-        rows = (
-            await session.execute(
-                select(Entries.id, Entries.title, Entries.created_at).where(
-                    Entries.user_id == current_user.id
+        entry = Entries(
+            title=title,
+            user_id=current_user.id,
+            content="",
+            search_vector=SearchVector(title, ""),
+        )
+        session.add(entry)
+        await session.flush()
+
+        async def insertRows(final: bool = False) -> None:
+            nonlocal unindexed
+            if rows:
+                await session.execute(insert(EntryChunks), rows)
+            text = unindexed + "".join(row["content"] for row in rows)
+            rows.clear()
+            # A word cut at the batch boundary waits to be indexed whole
+            cut = len(text) if final else max(map(text.rfind, " \t\r\n")) + 1
+            if cut == 0:
+                cut = len(text)
+            text, unindexed = text[:cut], text[cut:]
+            if text:
+                await session.execute(
+                    update(Entries)
+                    .where(Entries.id == entry.id)
+                    .values(search_vector=AppendSearchText(Entries.search_vector, text))
+                    .execution_options(synchronize_session=False)
                 )
+
+        async def emit(text: str) -> None:
+            nonlocal seq, length
+            rows.append(
+                {
+                    "entry_id": entry.id,
+                    "seq": seq,
+                    "start": length,
+                    "length": len(text),
+                    "content": text,
+                }
             )
-        ).all()
+            seq += 1
+            length += len(text)
+            if len(rows) >= DOCUMENT_INSERT_BATCH:
+                await insertRows()
 
-        entries = [
-            EntrySummary(id=row.id, title=row.title, date=row.created_at)
-            for row in rows
-        ]
-        return entries
+        async for data in chunks:
+            received += len(data)
+            if received > DOCUMENT_MAX_BYTES:
+                raise HTTPException(status_code=413, detail="Document too large")
+            try:
+                pending += decoder.decode(data)
+            except UnicodeDecodeError:
+                raise HTTPException(status_code=400, detail="Document is not UTF-8")
+            while len(pending) >= DOCUMENT_CHUNK_CHARS:
+                await emit(pending[:DOCUMENT_CHUNK_CHARS])
+                pending = pending[DOCUMENT_CHUNK_CHARS:]
+
+        try:
+            pending += decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Document is not UTF-8")
+        if pending:
+            await emit(pending)
+        if rows or unindexed:
+            await insertRows(final=True)
+        if length == 0:
+            raise HTTPException(status_code=400, detail="Document is empty")
+
+        entry.chunk_count = seq
+        entry.length = length
+        await bumpLibraryVersion(session, current_user.id)
+        await session.commit()
+        return UploadDocumentOut(id=entry.id, length=length, chunks=seq)
     except Exception:
+        await session.rollback()
         raise
 
 
-async def deleteEntryById(entry_id: int, current_user: Users, session: AsyncSession):
+async def streamEntryContent(
+    entry_id: int,
+    start: int,
+    end: int | None,
+    current_user: CurrentUser,
+    session: AsyncSession,
+    sessionmaker,
+) -> AsyncIterator[str]:
+    """
+    Characters [start, end) of an entry, inline or chunked. Ownership is
+    checked up front; the returned iterator reads the overlapping chunks
+    through a server-side cursor in its own session, one chunk at a time.
+    """
+    entry = (
+        await session.execute(
+            select(
+                Entries.content,
+                Entries.content_z,
+                Entries.compression,
+                Entries.chunk_count,
+                Entries.length,
+            ).where(Entries.id == entry_id, Entries.user_id == current_user.id)
+        )
+    ).one_or_none()
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+
+    if not entry.chunk_count:
+
+        text = decompressContent(entry.content, entry.content_z, entry.compression)
+
+        async def inline() -> AsyncIterator[str]:
+            yield text[start:end]
+
+        return inline()
+
+    stop = entry.length if end is None else min(end, entry.length)
+
+    async def chunked() -> AsyncIterator[str]:
+        if start >= stop:
+            return
+        query = (
+            select(EntryChunks.start, EntryChunks.content)
+            .where(
+                EntryChunks.entry_id == entry_id,
+                EntryChunks.start < stop,
+                EntryChunks.start + EntryChunks.length > start,
+            )
+            .order_by(EntryChunks.seq)
+            .execution_options(yield_per=4)
+        )
+        async with sessionmaker() as stream_session:
+            result = await stream_session.stream(query)
+            async for row in result:
+                yield row.content[max(start - row.start, 0) : stop - row.start]
+
+    return chunked()
+
+
+async def exportEntries(
+    current_user: CurrentUser, fmt: str, sessionmaker, store: EntryAudioStore
+) -> AsyncIterator[bytes]:
+    """
+    The export body. It outlives the request's session, so it reads through
+    its own, held for the whole download.
+    """
+    async with sessionmaker() as session:
+        if fmt == "zip":
+            pieces = exportArchive(current_user.id, session, store)
+        else:
+            pieces = exportLines(current_user.id, session)
+        async for piece in pieces:
+            if piece:
+                yield piece
+
+
+async def exportLines(user_id: int, session: AsyncSession) -> AsyncIterator[bytes]:
+    """
+    The user's entries as NDJSON, oldest first. Entries come off a server-side
+    cursor `EXPORT_FETCH_SIZE` rows at a time, and a chunked document's text
+    is written chunk by chunk into its line, so memory stays flat however
+    large the library or its documents are.
+    """
+    query = (
+        select(
+            Entries.id,
+            Entries.title,
+            Entries.content,
+            Entries.content_z,
+            Entries.compression,
+            Entries.created_at,
+            Entries.chunk_count,
+        )
+        .where(Entries.user_id == user_id)
+        .order_by(Entries.created_at, Entries.id)
+        .execution_options(yield_per=EXPORT_FETCH_SIZE)
+    )
+    result = await session.stream(query)
+    async for row in result:
+        meta = json.dumps(
+            {
+                "id": row.id,
+                "title": row.title,
+                "created_at": row.created_at.isoformat(),
+            },
+            ensure_ascii=False,
+        )
+        # Content goes last, so it can be streamed into the open string
+        yield (meta[:-1] + ', "content": "').encode()
+        if not row.chunk_count:
+            text = decompressContent(row.content, row.content_z, row.compression)
+            yield json.dumps(text, ensure_ascii=False)[1:-1].encode()
+        else:
+            chunks = await session.stream(
+                select(EntryChunks.content)
+                .where(EntryChunks.entry_id == row.id)
+                .order_by(EntryChunks.seq)
+                .execution_options(yield_per=4)
+            )
+            async for chunk in chunks.scalars():
+                yield json.dumps(chunk, ensure_ascii=False)[1:-1].encode()
+        yield b'"}\n'
+
+
+class _Drain(io.RawIOBase):
+    """Unseekable sink for ZipFile; what it receives is taken out piecewise."""
+
+    def __init__(self):
+        self.parts: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+async def exportArchive(
+    user_id: int, session: AsyncSession, store: EntryAudioStore
+) -> AsyncIterator[bytes]:
+    """
+    A zip of entries.ndjson plus every stored rendering as
+    audio/<entry id>/<name>.mp3. Written to an unseekable sink (sizes go in
+    data descriptors), so each piece is sent as soon as it is compressed.
+    """
+    sink = _Drain()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("entries.ndjson", "w", force_zip64=True) as member:
+            async for piece in exportLines(user_id, session):
+                member.write(piece)
+                yield sink.take()
+
+        ids = await session.stream_scalars(
+            select(Entries.id)
+            .where(Entries.user_id == user_id)
+            .order_by(Entries.created_at, Entries.id)
+            .execution_options(yield_per=EXPORT_FETCH_SIZE)
+        )
+        async for entry_id in ids:
+            blobs = await asyncio.to_thread(store.blobs.list_group, str(entry_id))
+            for blob in blobs:
+                info = zipfile.ZipInfo(f"audio/{blob.key}")
+                # MP3 is compressed already
+                info.compress_type = zipfile.ZIP_STORED
+                with archive.open(info, "w", force_zip64=True) as member:
+                    async for data in readBlob(store, blob.key):
+                        member.write(data)
+                        yield sink.take()
+    yield sink.take()
+
+
+async def readBlob(store: EntryAudioStore, key: str) -> AsyncIterator[bytes]:
+    path = store.blobs.local_path(key)
+    if path is None:
+        # A remote store: read it a range at a time, never whole
+        blob = await asyncio.to_thread(store.blobs.stat, key)
+        position = 0
+        while blob is not None and position < blob.size:
+            data = await asyncio.to_thread(
+                store.blobs.read_range, key, position, position + EXPORT_AUDIO_READ
+            )
+            if not data:
+                return
+            position += len(data)
+            yield data
+        return
+    try:
+        f = await asyncio.to_thread(open, path, "rb")
+    except FileNotFoundError:
+        # Deleted along with its entry since the listing
+        return
+    try:
+        while data := await asyncio.to_thread(f.read, EXPORT_AUDIO_READ):
+            yield data
+    finally:
+        f.close()
+
+
+def encodeCursor(created_at: datetime, entry_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), entry_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decodeCursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, entry_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(entry_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def listEntries(
+    current_user: CurrentUser,
+    session: AsyncSession,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> ListEntriesOut:
+    """
+    One page of the user's entries, oldest first, keyed on (created_at, id)
+    so every page is an index range scan on ix_entries_user_created_id no
+    matter how deep it is. The page carries the cursor of the next one.
+    """
+    try:
+        query = (
+            select(Entries.id, Entries.title, Entries.created_at.label("date"))
+            .where(Entries.user_id == current_user.id)
+            .order_by(Entries.created_at, Entries.id)
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            query = query.where(
+                tuple_(Entries.created_at, Entries.id) > decodeCursor(cursor)
+            )
+        rows = (await session.execute(query)).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encodeCursor(rows[-1].date, rows[-1].id)
+
+        # Rows go to pydantic-core as mappings: validated in one call
+        return ListEntriesOut.model_validate(
+            {"entries": [row._mapping for row in rows], "next_cursor": next_cursor}
+        )
+    except Exception:
+        raise
+
+
+SEARCH_HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=5"
+
+
+async def searchEntries(
+    query: str,
+    current_user: CurrentUser,
+    session: AsyncSession,
+    limit: int = 20,
+    offset: int = 0,
+) -> SearchEntriesOut:
+    """
+    Ranked full-text search over the user's entries. Matching goes through the
+    GIN index on search_vector; snippets (ts_headline, which re-parses the
+    text) are only computed for the rows of the requested page.
+    """
+    if session.bind.dialect.name != "postgresql":
+        raise HTTPException(status_code=501, detail="Search requires PostgreSQL")
+
+    tsquery = func.websearch_to_tsquery(search_config(), query)
+    rank = func.ts_rank_cd(Entries.search_vector, tsquery)
+    rows = (
+        await session.execute(
+            select(
+                Entries.id,
+                Entries.title,
+                Entries.content,
+                Entries.content_z,
+                Entries.compression,
+                Entries.created_at,
+                rank.label("rank"),
+            )
+            .where(
+                Entries.user_id == current_user.id,
+                Entries.search_vector.bool_op("@@")(tsquery),
+            )
+            .order_by(rank.desc(), Entries.id)
+            .limit(limit + 1)
+            .offset(offset)
+        )
+    ).all()
+
+    next_offset = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_offset = offset + limit
+
+    snippets = []
+    if rows:
+        # Content may be compressed at rest, so the page's texts are sent back
+        # for ts_headline instead of being read from the column
+        texts = (
+            func.unnest(
+                bindparam(
+                    "texts",
+                    [
+                        decompressContent(r.content, r.content_z, r.compression)
+                        for r in rows
+                    ],
+                    type_=ARRAY(Text),
+                )
+            )
+            .table_valued("text", with_ordinality="n")
+            .render_derived(name="page")
+        )
+        snippets = (
+            (
+                await session.execute(
+                    select(
+                        func.ts_headline(
+                            search_config(),
+                            texts.c.text,
+                            tsquery,
+                            SEARCH_HEADLINE_OPTIONS,
+                        )
+                    ).order_by(texts.c.n)
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+    return SearchEntriesOut(
+        results=[
+            SearchResult(
+                id=row.id,
+                title=row.title,
+                date=row.created_at,
+                rank=row.rank,
+                snippet=snippet,
+            )
+            for row, snippet in zip(rows, snippets)
+        ],
+        next_offset=next_offset,
+    )
+
+
+async def getEntryAudio(
+    entry_id: int,
+    voice: str,
+    rate: str,
+    current_user: CurrentUser,
+    session: AsyncSession,
+    store: EntryAudioStore,
+) -> str:
+    owned = (
+        await session.execute(
+            select(Entries.id).where(
+                Entries.id == entry_id, Entries.user_id == current_user.id
+            )
+        )
+    ).scalar_one_or_none()
+    if owned is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+
+    key = store.get(entry_id, voice, rate)
+    if key is not None:
+        return key
+
+    # Not pre-rendered (yet) or another voice: render now and keep it
+    entry = (
+        await session.execute(
+            select(
+                Entries.content,
+                Entries.content_z,
+                Entries.compression,
+                Entries.chunk_count,
+            ).where(Entries.id == entry_id)
+        )
+    ).one_or_none()
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    if entry.chunk_count:
+        raise HTTPException(
+            status_code=422, detail="Documents are too long to synthesize at once"
+        )
+    content = decompressContent(entry.content, entry.content_z, entry.compression)
+
+    try:
+        store.prepare(entry_id)
+        return await TTSController.render_entry(entry_id, content, store, voice, rate)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Entry not found")
+
+
+async def deleteEntryById(
+    entry_id: int,
+    current_user: CurrentUser,
+    session: AsyncSession,
+    store: EntryAudioStore,
+):
     try:
         result = await session.execute(
             Delete(Entries).where(
                 Entries.id == entry_id, Entries.user_id == current_user.id
             )
         )
-        await session.commit()
         if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Entry not found")
+        await bumpLibraryVersion(session, current_user.id)
+        await session.commit()
     except Exception:
         await session.rollback()
         raise
+
+    await asyncio.to_thread(store.delete, entry_id)
@@ -1,11 +1,70 @@
+import os
+import time
 from typing import AsyncGenerator
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     async_sessionmaker,
+    create_async_engine,
 )
+from sqlalchemy.orm import ORMExecuteState, Session
 from fastapi import Request
 
+from app.metrics import db_checkout_wait
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+# Per worker process: workers x (size + overflow) must fit max_connections
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "1") == "1"
+DB_ECHO = os.getenv("DB_ECHO", "0") == "1"
+# asyncpg prepared statements kept per connection; 0 behind pgbouncer
+# in transaction mode
+DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+
+
+def create_engine() -> AsyncEngine:
+    """The application's one engine, configured from the environment."""
+    url = make_url(DATABASE_URL)
+    options = {"echo": DB_ECHO, "pool_pre_ping": DB_POOL_PRE_PING}
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {
+            "prepared_statement_cache_size": DB_STATEMENT_CACHE_SIZE
+        }
+    return create_async_engine(url, **options)
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {"pool": type(pool).__name__}
+    size = pool.size()
+    # The pool's own limit, which is not DB_MAX_OVERFLOW on SQLite; QueuePool
+    # has no public accessor for it
+    max_overflow = max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    return {
+        "pool": type(pool).__name__,
+        "size": size,
+        "max_overflow": max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": checked_out,
+        "overflow": max(pool.overflow(), 0),
+        "timeout": pool.timeout(),
+        "saturation": checked_out / (size + max_overflow) if size else 0.0,
+    }
+
 
 def get_engine(request: Request) -> AsyncEngine:
     return request.app.state.engine
@@ -16,6 +75,35 @@ def get_sessionmaker(request: Request) -> async_sessionmaker[AsyncSession]:
 
 
 async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
-    Session = get_sessionmaker(request)
-    async with Session() as session:
+    # Lazy: no connection is checked out until the first statement, so a
+    # request that never reaches the database never waits on the pool
+    async with get_sessionmaker(request)() as session:
         yield session
+
+
+# Pool wait: from the statement (or flush) that needs a connection to the
+# transaction beginning on it, pre-ping included. A statement on a connection
+# already held begins nothing, and its mark is dropped when the transaction ends.
+_CHECKOUT_STARTED = "checkout_started"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_execute(state: ORMExecuteState) -> None:
+    state.session.info[_CHECKOUT_STARTED] = time.perf_counter()
+
+
+@event.listens_for(Session, "before_flush")
+def _mark_flush(session: Session, flush_context, instances) -> None:
+    session.info[_CHECKOUT_STARTED] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_begin")
+def _checked_out(session: Session, transaction, connection) -> None:
+    started = session.info.pop(_CHECKOUT_STARTED, None)
+    if started is not None:
+        db_checkout_wait.observe(time.perf_counter() - started)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _transaction_end(session: Session, transaction) -> None:
+    session.info.pop(_CHECKOUT_STARTED, None)
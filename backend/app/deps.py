@@ -1,20 +1,23 @@
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.errorHandler.authError import AuthError
-from .db import get_session
-from .models.user import Users
+from .db import get_sessionmaker
 from .security import decode_access_token
+from .userCache import CurrentUser, load_user, user_cache
 
 bearer = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
+    request: Request,
     creds: HTTPAuthorizationCredentials | None = Depends(bearer),
-    session: AsyncSession = Depends(get_session),
-) -> Users:
+) -> CurrentUser:
+    # Already resolved by AuthMiddleware on protected paths
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+
     if not creds or creds.scheme.lower() != "bearer":
         raise AuthError(status_code=401, message="Missing token")
     try:
@@ -23,8 +26,16 @@ async def get_current_user(
     except Exception:
         raise AuthError(status_code=401, message="Invalid or expired token")
 
-    result = await session.execute(select(Users).where(Users.id == user_id))
-    found = result.scalar_one_or_none()
+    cached = user_cache.get(user_id, creds.credentials)
+    if cached is not None:
+        return cached
+
+    # A session of its own, closed right away: the request's session would
+    # keep this connection checked out until the response is finished, which
+    # for a render or a stream is far longer than the lookup
+    async with get_sessionmaker(request)() as session:
+        found = await load_user(session, user_id)
     if not found:
         raise AuthError(status_code=404, message="User not found")
+    user_cache.put(user_id, creds.credentials, found)
     return found
@@ -7,6 +7,8 @@ from sqlalchemy.exc import (
     OperationalError,
     TimeoutError as SATimeoutError,
 )
+from app.metrics import errors
+from app.ratelimit import RateLimited
 from .authError import AuthError
 
 logger = logging.getLogger("uvicorn.error")
@@ -15,33 +17,48 @@ logger = logging.getLogger("uvicorn.error")
 def registerExceptionHandlers(app: FastAPI) -> None:
     @app.exception_handler(IntegrityError)
     async def _integrity(_: Request, exc: IntegrityError):
+        errors.inc("integrity")
         return JSONResponse(status_code=409, content={"detail": "Integrity violation"})
 
     @app.exception_handler(DataError)
     async def _data(_: Request, exc: DataError):
+        errors.inc("data")
         return JSONResponse(
             status_code=400, content={"detail": "Invalid or too long data"}
         )
 
     @app.exception_handler(OperationalError)
     async def _operational(_: Request, exc: OperationalError):
+        errors.inc("operational")
         logger.exception("OperationalError")
         return JSONResponse(status_code=503, content={"detail": "Database unavailable"})
 
     @app.exception_handler(SATimeoutError)
     async def _timeout(_: Request, exc: SATimeoutError):
+        errors.inc("timeout")
         logger.exception("DB Timeout")
         return JSONResponse(status_code=503, content={"detail": "Database timeout"})
 
     @app.exception_handler(AuthError)
     async def _unauthorized(_: Request, exc: AuthError):
+        errors.inc("unauthorized")
         logger.exception("Unauthorized error")
         return JSONResponse(
             status_code=exc.status_code, content={"detail": exc.message}
         )
 
+    @app.exception_handler(RateLimited)
+    async def _rate_limited(_: Request, exc: RateLimited):
+        errors.inc("rate_limited")
+        return JSONResponse(
+            status_code=429,
+            content={"detail": f"Synthesis {exc.limit} limit exceeded"},
+            headers=exc.headers(),
+        )
+
     @app.exception_handler(Exception)
     async def _unhandled(_: Request, exc: Exception):
+        errors.inc("unhandled")
         logger.exception("Unhandled error")
         return JSONResponse(
             status_code=500, content={"detail": "Internal server error"}
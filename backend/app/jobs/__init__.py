@@ -0,0 +1,2 @@
+from .queue import Job, JobQueue, QueueFull, create_job_queue, get_job_queue
+from .pool import JOBS_INPROCESS, JOBS_WORKERS, WorkerPool
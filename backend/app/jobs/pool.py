@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import os
+
+from app.controllers import TTSController
+from app.tts.cache import AudioCache, cache_key
+
+from .queue import Job, JobQueue
+
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "2"))
+# With a shared queue the pool can run in dedicated `python -m app.jobs.worker`
+# processes instead, and the API only enqueues
+JOBS_INPROCESS = os.getenv("JOBS_INPROCESS", "1") == "1"
+# Pause after a queue error before a worker tries again
+JOBS_ERROR_BACKOFF = 1.0
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class WorkerPool:
+    """
+    `concurrency` workers pulling jobs off `queue`. Results land in the audio
+    cache, so the job only records the cache key.
+    """
+
+    def __init__(self, queue: JobQueue, cache: AudioCache, concurrency: int):
+        self.queue = queue
+        self.cache = cache
+        self.concurrency = concurrency
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"synthesis-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                await self._run(await self.queue.next())
+            except Exception:
+                # The queue itself failed (e.g. a locked SQLite file): keep the
+                # worker alive; a job left running is handed out again once stale
+                logger.exception("Synthesis worker error")
+                await asyncio.sleep(JOBS_ERROR_BACKOFF)
+
+    async def _run(self, job: Job) -> None:
+        try:
+            await TTSController.speak(job.text, job.voice, self.cache, job.rate)
+        except Exception as exc:
+            logger.exception("Synthesis job %s failed", job.id)
+            await self.queue.fail(job.id, str(exc) or type(exc).__name__)
+        else:
+            await self.queue.complete(job.id, cache_key(job.text, job.voice, job.rate))
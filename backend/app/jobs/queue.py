@@ -0,0 +1,310 @@
+import asyncio
+import os
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from fastapi import Request
+
+JOBS_BACKEND = os.getenv("JOBS_BACKEND", "memory")
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "/tmp/vocodex/jobs.sqlite3")
+JOBS_MAX_QUEUE = int(os.getenv("JOBS_MAX_QUEUE", "100"))
+JOBS_RETAIN_SECONDS = int(os.getenv("JOBS_RETAIN_SECONDS", "3600"))
+JOBS_STALE_SECONDS = int(os.getenv("JOBS_STALE_SECONDS", "600"))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "0.2"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class QueueFull(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    text: str
+    voice: str
+    rate: str
+    user_id: int | None
+    status: str = QUEUED
+    result_key: str | None = None
+    error: str | None = None
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+
+class JobQueue(ABC):
+    """
+    Synthesis jobs waiting for a worker, each owned by the user that
+    submitted it. `submit` raises QueueFull once `max_depth` jobs are queued;
+    finished jobs are kept `retain_seconds` so their status and result can
+    still be fetched.
+    """
+
+    @abstractmethod
+    async def submit(self, text: str, voice: str, rate: str, user_id: int) -> Job:
+        ...
+
+    @abstractmethod
+    async def get(self, job_id: str) -> Job | None:
+        ...
+
+    @abstractmethod
+    async def next(self) -> Job:
+        """Waits for a queued job and marks it running."""
+        ...
+
+    @abstractmethod
+    async def complete(self, job_id: str, result_key: str) -> None:
+        ...
+
+    @abstractmethod
+    async def fail(self, job_id: str, error: str) -> None:
+        ...
+
+    @abstractmethod
+    async def depth(self) -> int:
+        ...
+
+
+class MemoryJobQueue(JobQueue):
+    """In-process queue, only usable by workers running in the same process."""
+
+    def __init__(self, max_depth: int, retain_seconds: int):
+        self.max_depth = max_depth
+        self.retain_seconds = retain_seconds
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=max_depth)
+
+    def _prune(self, now: float) -> None:
+        # Jobs are ordered by creation, so stop at the first one still fresh
+        for job_id, job in list(self._jobs.items()):
+            if now - job.created_at < self.retain_seconds:
+                break
+            if job.status in (DONE, FAILED):
+                del self._jobs[job_id]
+
+    async def submit(self, text: str, voice: str, rate: str, user_id: int) -> Job:
+        now = time.time()
+        self._prune(now)
+        job = Job(
+            uuid.uuid4().hex, text, voice, rate, user_id, created_at=now, updated_at=now
+        )
+        try:
+            self._queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            raise QueueFull()
+        self._jobs[job.id] = job
+        return job
+
+    async def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    async def next(self) -> Job:
+        while True:
+            job = self._jobs.get(await self._queue.get())
+            if job is not None:
+                job.status, job.updated_at = RUNNING, time.time()
+                return job
+
+    async def complete(self, job_id: str, result_key: str) -> None:
+        job = self._jobs.get(job_id)
+        if job:
+            job.status, job.result_key, job.updated_at = DONE, result_key, time.time()
+
+    async def fail(self, job_id: str, error: str) -> None:
+        job = self._jobs.get(job_id)
+        if job:
+            job.status, job.error, job.updated_at = FAILED, error, time.time()
+
+    async def depth(self) -> int:
+        return self._queue.qsize()
+
+
+class SqliteJobQueue(JobQueue):
+    """
+    Queue in a local SQLite file, shared by every API worker and by separate
+    `python -m app.jobs.worker` processes on the same host.
+    """
+
+    _COLUMNS = "id, text, voice, rate, user_id, status, result_key, error, created_at, updated_at"
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_depth: int,
+        retain_seconds: int,
+        stale_seconds: int,
+        poll_interval: float,
+    ):
+        self.path = Path(path)
+        self.max_depth = max_depth
+        self.retain_seconds = retain_seconds
+        self.stale_seconds = stale_seconds
+        self.poll_interval = poll_interval
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    voice TEXT NOT NULL,
+                    rate TEXT NOT NULL,
+                    user_id INTEGER,
+                    status TEXT NOT NULL,
+                    result_key TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+            # Files created before jobs had owners; their old jobs belong to nobody
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "user_id" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN user_id INTEGER")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_jobs_status_created ON jobs (status, created_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly where needed
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _submit(self, text: str, voice: str, rate: str, user_id: int) -> Job:
+        now = time.time()
+        job = Job(
+            uuid.uuid4().hex, text, voice, rate, user_id, created_at=now, updated_at=now
+        )
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND created_at < ?",
+                (DONE, FAILED, now - self.retain_seconds),
+            )
+            # A worker that died mid-job leaves it running: hand it out again
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? "
+                "WHERE status = ? AND updated_at < ?",
+                (QUEUED, now, RUNNING, now - self.stale_seconds),
+            )
+            (depth,) = conn.execute(
+                "SELECT count(*) FROM jobs WHERE status = ?", (QUEUED,)
+            ).fetchone()
+            if depth >= self.max_depth:
+                conn.execute("ROLLBACK")
+                raise QueueFull()
+            conn.execute(
+                f"INSERT INTO jobs ({self._COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job.id,
+                    job.text,
+                    job.voice,
+                    job.rate,
+                    job.user_id,
+                    job.status,
+                    job.result_key,
+                    job.error,
+                    job.created_at,
+                    job.updated_at,
+                ),
+            )
+            conn.execute("COMMIT")
+            return job
+        finally:
+            conn.close()
+
+    def _get(self, job_id: str) -> Job | None:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            return Job(*row) if row else None
+        finally:
+            conn.close()
+
+    def _claim(self) -> Job | None:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"""
+                UPDATE jobs SET status = ?, updated_at = ?
+                WHERE id = (
+                    SELECT id FROM jobs WHERE status = ?
+                    ORDER BY created_at LIMIT 1
+                )
+                RETURNING {self._COLUMNS}
+                """,
+                (RUNNING, time.time(), QUEUED),
+            ).fetchone()
+            return Job(*row) if row else None
+        finally:
+            conn.close()
+
+    def _finish(self, job_id: str, status: str, result_key: str | None, error: str | None):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result_key = ?, error = ?, updated_at = ? "
+                "WHERE id = ?",
+                (status, result_key, error, time.time(), job_id),
+            )
+        finally:
+            conn.close()
+
+    def _depth(self) -> int:
+        conn = self._connect()
+        try:
+            (depth,) = conn.execute(
+                "SELECT count(*) FROM jobs WHERE status = ?", (QUEUED,)
+            ).fetchone()
+            return depth
+        finally:
+            conn.close()
+
+    async def submit(self, text: str, voice: str, rate: str, user_id: int) -> Job:
+        return await asyncio.to_thread(self._submit, text, voice, rate, user_id)
+
+    async def get(self, job_id: str) -> Job | None:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def next(self) -> Job:
+        while True:
+            job = await asyncio.to_thread(self._claim)
+            if job is not None:
+                return job
+            await asyncio.sleep(self.poll_interval)
+
+    async def complete(self, job_id: str, result_key: str) -> None:
+        await asyncio.to_thread(self._finish, job_id, DONE, result_key, None)
+
+    async def fail(self, job_id: str, error: str) -> None:
+        await asyncio.to_thread(self._finish, job_id, FAILED, None, error)
+
+    async def depth(self) -> int:
+        return await asyncio.to_thread(self._depth)
+
+
+def create_job_queue() -> JobQueue:
+    if JOBS_BACKEND == "sqlite":
+        return SqliteJobQueue(
+            JOBS_DB_PATH,
+            JOBS_MAX_QUEUE,
+            JOBS_RETAIN_SECONDS,
+            JOBS_STALE_SECONDS,
+            JOBS_POLL_INTERVAL,
+        )
+    return MemoryJobQueue(JOBS_MAX_QUEUE, JOBS_RETAIN_SECONDS)
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    return request.app.state.job_queue
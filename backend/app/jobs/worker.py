@@ -0,0 +1,38 @@
+"""
+Standalone synthesis worker: `python -m app.jobs.worker`
+
+Needs JOBS_BACKEND=sqlite and the same JOBS_DB_PATH / AUDIO_CACHE_DIR as the
+API processes, which should then run with JOBS_INPROCESS=0.
+"""
+
+import asyncio
+import logging
+
+from app.tts.cache import create_audio_cache
+
+from .pool import JOBS_WORKERS, WorkerPool
+from .queue import SqliteJobQueue, create_job_queue
+
+
+async def main() -> None:
+    queue = create_job_queue()
+    if not isinstance(queue, SqliteJobQueue):
+        raise SystemExit("A separate worker needs JOBS_BACKEND=sqlite")
+
+    pool = WorkerPool(queue, create_audio_cache(), JOBS_WORKERS)
+    pool.start()
+    logging.getLogger("uvicorn.error").info(
+        "Synthesis worker started with %s workers", JOBS_WORKERS
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await pool.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,41 +1,59 @@
+import asyncio
 from contextlib import asynccontextmanager
-import os
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.ext.asyncio import (
-    create_async_engine,
-    AsyncSession,
-    async_sessionmaker,
-)
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy import text
 
-from app.models.base import Base
+from app.controllers import TTSController
+from app.compression import ENTRY_COMPRESSION_BACKFILL, runCompressionBackfill
+from app.migrations import check_schema
+from app.metrics import CONTENT_TYPE, collect_pool, registry
 from app.middlewares.auth import AuthMiddleware
+from app.middlewares.metrics import MetricsMiddleware
+from app.jobs import JOBS_INPROCESS, JOBS_WORKERS, WorkerPool, create_job_queue
+from app.ratelimit import create_rate_limiter
 from app.routers import entries, synthesis
+from app.tts.cache import create_audio_cache
+from app.tts.store import create_entry_audio_store
+from app.tts.voices import create_voice_catalog
 
-from .db import get_session
-
-DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_async_engine(DATABASE_URL, echo=False)
+from .db import create_engine, get_engine, get_session, pool_stats
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    engine = create_async_engine(
-        DATABASE_URL,
-        pool_size=5,
-        max_overflow=10,
-        pool_pre_ping=True,
-        pool_recycle=1800,
-        echo=True,
-    )
+    engine = create_engine()
     app.state.engine = engine
+    pool_metrics = collect_pool(engine)
+    registry.add_collector(pool_metrics)
     app.state.sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    app.state.audio_cache = create_audio_cache()
+    app.state.entry_audio = create_entry_audio_store()
+    app.state.job_queue = create_job_queue()
+    app.state.rate_limiter = create_rate_limiter()
+    app.state.voice_catalog = create_voice_catalog(TTSController.tts_engine)
+    pool = WorkerPool(app.state.job_queue, app.state.audio_cache, JOBS_WORKERS)
+    backfill = None
     try:
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        # One SELECT; migrations run separately (python -m app.migrations)
+        await check_schema(engine)
+        # Fetched in the background; the first validation waits for it
+        app.state.voice_catalog.refresh()
+        if JOBS_INPROCESS:
+            pool.start()
+        if ENTRY_COMPRESSION_BACKFILL:
+            backfill = asyncio.create_task(
+                runCompressionBackfill(app.state.sessionmaker)
+            )
         yield
     finally:
+        if backfill is not None:
+            backfill.cancel()
+            await asyncio.gather(backfill, return_exceptions=True)
+        await app.state.voice_catalog.close()
+        await pool.stop()
+        registry.remove_collector(pool_metrics)
         await engine.dispose()
 
 
@@ -49,6 +67,8 @@ app.add_middleware(
     CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]
 )
 app.add_middleware(AuthMiddleware, protected_paths=("/upload",))
+# Outermost, so requests rejected by the other middlewares are counted too
+app.add_middleware(MetricsMiddleware)
 
 # Routers
 from .routers import auth
@@ -63,7 +83,18 @@ def health():
     return {"ok": True}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    # Prometheus text format, values of this worker process
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
 @app.get("/db/health")
 async def db_health(session: AsyncSession = Depends(get_session)) -> dict:
     row = await session.execute(text("select 1"))
     return {"db": "ok", "result": row.scalar_one()}
+
+
+@app.get("/db/pool")
+def db_pool(engine: AsyncEngine = Depends(get_engine)) -> dict:
+    return pool_stats(engine)
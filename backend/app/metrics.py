@@ -0,0 +1,259 @@
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prometheus client defaults, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """
+    One metric family. Values are kept per label tuple in plain dicts behind
+    a lock, so recording is a dict lookup and an addition; all formatting
+    happens at scrape time. Values are per process.
+    """
+
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        ...
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.label_names, key)} {_number(value)}"
+            for key, value in values
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label tuple: [count per bucket (+Inf last)..., sum]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            slots = self._values.get(labels)
+            if slots is None:
+                slots = self._values[labels] = [0] * (len(self.buckets) + 2)
+            slots[index] += 1
+            slots[-1] += value
+
+    @contextmanager
+    def time(self, *labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def count(self, *labels) -> int:
+        slots = self._values.get(labels)
+        return sum(slots[:-1]) if slots else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = [(key, list(slots)) for key, slots in self._values.items()]
+        lines = self.header()
+        for key, slots in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), slots[:-1]):
+                cumulative += count
+                le = _labels(self.label_names, key, f'le="{_number(float(bound))}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_number(slots[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        # Run before each scrape, for values read off live objects (pools)
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def add_collector(self, collect: Callable[[], None]) -> None:
+        self._collectors.append(collect)
+
+    def remove_collector(self, collect: Callable[[], None]) -> None:
+        if collect in self._collectors:
+            self._collectors.remove(collect)
+
+    def render(self) -> str:
+        for collect in list(self._collectors):
+            collect()
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to the end of the response body",
+    ("method", "route"),
+)
+http_in_flight = registry.gauge(
+    "http_requests_in_flight", "Requests being handled", ("method",)
+)
+errors = registry.counter(
+    "app_errors_total", "Errors turned into responses by handler", ("handler",)
+)
+
+db_checkout_wait = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time a request waited for a database connection",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5, 30),
+)
+db_pool_size = registry.gauge("db_pool_size", "Configured pool size")
+db_pool_checked_out = registry.gauge(
+    "db_pool_checked_out", "Connections in use by the application"
+)
+db_pool_overflow = registry.gauge(
+    "db_pool_overflow", "Connections open beyond the pool size"
+)
+db_pool_saturation = registry.gauge(
+    "db_pool_saturation", "Checked out connections over size + max overflow"
+)
+
+tts_synthesis_duration = registry.histogram(
+    "tts_synthesis_duration_seconds",
+    "Time to render a text to MP3",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+tts_synthesis_bytes = registry.counter(
+    "tts_synthesis_bytes_total", "MP3 bytes produced by synthesis"
+)
+tts_synthesis_failures = registry.counter(
+    "tts_synthesis_failures_total", "Renders that raised"
+)
+
+synthesis_rate_limited = registry.counter(
+    "synthesis_rate_limited_total",
+    "Synthesis requests refused by per-user limits",
+    ("limit",),
+)
+
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds",
+    "bcrypt time per operation",
+    ("operation",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+
+def collect_pool(engine) -> Callable[[], None]:
+    """A collector publishing the saturation of `engine`'s QueuePool."""
+    from app.db import pool_stats
+
+    def collect() -> None:
+        stats = pool_stats(engine)
+        if "size" not in stats:
+            return
+        db_pool_size.set(value=stats["size"])
+        db_pool_checked_out.set(value=stats["checked_out"])
+        db_pool_overflow.set(value=stats["overflow"])
+        db_pool_saturation.set(value=stats["saturation"])
+
+    return collect
@@ -1,47 +1,67 @@
 from typing import Iterable
-from fastapi import Request, Response
-from sqlalchemy import select
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.errorHandler.authError import AuthError
-from app.models.user import Users
 from app.security import decode_access_token
+from app.userCache import CurrentUser, load_user, user_cache
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, protected_paths: Iterable[str]):
-        super().__init__(app)
+class AuthMiddleware:
+    """
+    Pure ASGI auth gate for `protected_paths`. Everything else, and every
+    response body (streams included), passes through untouched. The resolved
+    user goes to `request.state.user`, where `get_current_user` picks it up.
+    """
+
+    def __init__(self, app: ASGIApp, protected_paths: Iterable[str]):
+        self.app = app
         self.protected_paths = tuple(protected_paths)
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        if not request.url.path.startswith(self.protected_paths):
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(
+            self.protected_paths
+        ):
+            await self.app(scope, receive, send)
+            return
 
         try:
-            auth_header = request.headers.get("Authorization")
-            if not auth_header or not auth_header.lower().startswith("bearer "):
-                raise AuthError(401, "Missing token")
+            user = await self.authenticate(scope)
+        except AuthError as exc:
+            response = JSONResponse(
+                status_code=exc.status_code, content={"detail": exc.message}
+            )
+            await response(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
 
-            token = auth_header.split(" ", 1)[1]
+    async def authenticate(self, scope: Scope) -> CurrentUser:
+        auth_header = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value.decode("latin-1")
+                break
+        if not auth_header or not auth_header.lower().startswith("bearer "):
+            raise AuthError(401, "Missing token")
 
-            try:
-                payload = decode_access_token(token)
-                user_id = int(payload["sub"])
-            except Exception:
-                raise AuthError(401, "Invalid or expired token")
+        token = auth_header.split(" ", 1)[1]
 
-            sessionmaker = request.app.state.sessionmaker
+        try:
+            payload = decode_access_token(token)
+            user_id = int(payload["sub"])
+        except Exception:
+            raise AuthError(401, "Invalid or expired token")
+
+        user = user_cache.get(user_id, token)
+        if user is None:
+            sessionmaker = scope["app"].state.sessionmaker
             async with sessionmaker() as session:
-                result = await session.execute(select(Users).where(Users.id == user_id))
-                user = result.scalar_one_or_none()
+                user = await load_user(session, user_id)
 
-                if not user:
-                    raise AuthError(404, "User not found")
+            if not user:
+                raise AuthError(404, "User not found")
+            user_cache.put(user_id, token, user)
 
-                request.state.user = user
-                return await call_next(request)
-        except AuthError as exc:
-            return JSONResponse(status_code=exc.status_code, content={"detail": exc.message})
+        return user
@@ -0,0 +1,46 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.metrics import http_in_flight, http_request_duration, http_requests
+
+UNMATCHED = "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI request metrics: in-flight gauge, status counter and latency
+    histogram (to the last body byte, so streams count in full). Requests are
+    labelled with the route template the router matched, not the raw path,
+    to keep cardinality bounded; the router only records it on its way in,
+    so the in-flight gauge is per method. Lifespan and websocket traffic
+    passes through.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = getattr(scope.get("route"), "path", UNMATCHED)
+            http_request_duration.observe(elapsed, method, route)
+            http_requests.inc(method, route, str(status))
+            http_in_flight.dec(method)
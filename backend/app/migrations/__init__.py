@@ -0,0 +1,13 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from . import runner
+from .runner import DB_AUTO_MIGRATE, Migration, SchemaOutOfDate, current_version
+from .versions import LATEST, MIGRATIONS
+
+
+async def upgrade(engine: AsyncEngine) -> int:
+    return await runner.upgrade(engine, MIGRATIONS)
+
+
+async def check_schema(engine: AsyncEngine) -> int:
+    return await runner.check_schema(engine, MIGRATIONS)
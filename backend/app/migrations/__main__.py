@@ -0,0 +1,37 @@
+"""
+Schema migrations: `python -m app.migrations [upgrade|current]`
+
+`upgrade` applies pending migrations (safe to run from several places at
+once, e.g. every deploy); `current` prints the database's version.
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.db import create_engine
+
+from . import LATEST, current_version, upgrade
+
+
+async def main(command: str) -> None:
+    engine = create_engine()
+    try:
+        if command == "upgrade":
+            version = await upgrade(engine)
+            print(f"Schema at version {version}")
+        else:
+            async with engine.connect() as conn:
+                version = await current_version(conn)
+            print(f"Schema at version {version}, latest is {LATEST}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "command", choices=("upgrade", "current"), nargs="?", default="upgrade"
+    )
+    asyncio.run(main(parser.parse_args().command))
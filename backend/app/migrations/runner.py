@@ -0,0 +1,188 @@
+import logging
+import os
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+logger = logging.getLogger("uvicorn.error")
+
+# Startup runs pending migrations itself instead of refusing to boot; meant
+# for development and tests, production runs `python -m app.migrations upgrade`
+DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "0") == "1"
+
+# pg_advisory_lock key serializing concurrent upgrade runs
+LOCK_KEY = 0x766F636F  # "voco"
+
+Step = Callable[[AsyncConnection], Awaitable[None]]
+
+
+@dataclass
+class Migration:
+    """
+    One schema version. Every migration must be safe to re-run (IF NOT
+    EXISTS everywhere): non-transactional ones may stop half way, and the
+    first upgrade of a database created by create_all replays them all.
+
+    `transactional=False` runs the steps on an autocommit connection, which
+    CREATE INDEX CONCURRENTLY and batched backfills need.
+    """
+
+    version: int
+    name: str
+    steps: list[Step]
+    transactional: bool = True
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def sql(*statements: str) -> Step:
+    async def run(conn: AsyncConnection) -> None:
+        for statement in statements:
+            await conn.execute(text(statement))
+
+    return run
+
+
+def create_index_concurrently(name: str, definition: str) -> Step:
+    """
+    Builds an index without blocking writes. A previous CONCURRENTLY build
+    that failed leaves an INVALID index behind, which IF NOT EXISTS would
+    happily keep, so that one is dropped first.
+    """
+
+    async def run(conn: AsyncConnection) -> None:
+        invalid = (
+            await conn.execute(
+                text(
+                    "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+                    " WHERE c.relname = :name AND NOT i.indisvalid"
+                ),
+                {"name": name},
+            )
+        ).first()
+        if invalid:
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+        await conn.execute(
+            text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+        )
+
+    return run
+
+
+def backfill(statement: str, batch: int = 1000) -> Step:
+    """
+    Runs an UPDATE taking `:batch` rows at a time until it touches none, one
+    short transaction per batch so rows are never locked for long.
+    """
+
+    async def run(conn: AsyncConnection) -> None:
+        while (await conn.execute(text(statement), {"batch": batch})).rowcount:
+            pass
+
+    return run
+
+
+async def ensure_version_table(conn: AsyncConnection) -> None:
+    await conn.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_version ("
+            " version integer PRIMARY KEY,"
+            " name text NOT NULL,"
+            " applied_at timestamptz NOT NULL DEFAULT now())"
+        )
+    )
+
+
+async def current_version(conn: AsyncConnection) -> int:
+    """0 for a database that has never been migrated."""
+    exists = (
+        await conn.execute(text("SELECT to_regclass('schema_version')"))
+    ).scalar_one()
+    if exists is None:
+        return 0
+    version = (
+        await conn.execute(text("SELECT max(version) FROM schema_version"))
+    ).scalar_one()
+    return version or 0
+
+
+async def upgrade(engine: AsyncEngine, migrations: list[Migration]) -> int:
+    """
+    Applies pending migrations in order and returns the resulting version.
+    Holds an advisory lock meanwhile, so parallel runs wait for each other
+    and then find nothing left to do.
+    """
+    if engine.dialect.name != "postgresql":
+        # Local SQLite runs: no migrations, just the current models
+        from app.models import Base
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return migrations[-1].version
+
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": LOCK_KEY})
+        try:
+            await ensure_version_table(conn)
+            version = await current_version(conn)
+            for migration in migrations:
+                if migration.version <= version:
+                    continue
+                logger.info(
+                    "Applying migration %04d %s", migration.version, migration.name
+                )
+                if migration.transactional:
+                    async with engine.begin() as tx:
+                        for step in migration.steps:
+                            await step(tx)
+                        await record(tx, migration)
+                else:
+                    for step in migration.steps:
+                        await step(conn)
+                    await record(conn, migration)
+                version = migration.version
+            return version
+        finally:
+            await conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": LOCK_KEY}
+            )
+
+
+async def record(conn: AsyncConnection, migration: Migration) -> None:
+    await conn.execute(
+        text("INSERT INTO schema_version (version, name) VALUES (:version, :name)"),
+        {"version": migration.version, "name": migration.name},
+    )
+
+
+async def check_schema(engine: AsyncEngine, migrations: list[Migration]) -> int:
+    """
+    Startup path: one SELECT, no DDL and no locks. Raises SchemaOutOfDate if
+    migrations are pending, unless DB_AUTO_MIGRATE is set.
+    """
+    latest = migrations[-1].version
+    if engine.dialect.name != "postgresql":
+        return await upgrade(engine, migrations)
+
+    async with engine.connect() as conn:
+        version = await current_version(conn)
+    if version == latest:
+        return version
+    if version > latest:
+        logger.warning(
+            "Database schema is at version %s, newer than this code (%s)",
+            version,
+            latest,
+        )
+        return version
+    if DB_AUTO_MIGRATE:
+        return await upgrade(engine, migrations)
+    raise SchemaOutOfDate(
+        f"Database schema is at version {version}, expected {latest}: "
+        "run `python -m app.migrations upgrade`"
+    )
@@ -0,0 +1,102 @@
+from app.models.search import SEARCH_CONFIG
+
+from .runner import Migration, backfill, create_index_concurrently, sql
+
+MIGRATIONS = [
+    Migration(
+        1,
+        "initial schema",
+        [
+            sql(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " id SERIAL PRIMARY KEY,"
+                " username VARCHAR(120),"
+                " hashed_password VARCHAR(60) NOT NULL,"
+                " created_at TIMESTAMP WITH TIME ZONE DEFAULT now())",
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " id SERIAL PRIMARY KEY,"
+                " user_id INTEGER NOT NULL REFERENCES users (id) ON DELETE CASCADE,"
+                " title VARCHAR(1200),"
+                " content VARCHAR(10000) NOT NULL,"
+                " created_at TIMESTAMP WITH TIME ZONE DEFAULT now())",
+            )
+        ],
+    ),
+    Migration(
+        2,
+        "keyset pagination index",
+        [
+            create_index_concurrently(
+                "ix_entries_user_created_id",
+                "ON entries (user_id, created_at, id)",
+            ),
+            # Its leading column covers plain user_id lookups
+            sql("DROP INDEX CONCURRENTLY IF EXISTS ix_entries_user_id"),
+        ],
+        transactional=False,
+    ),
+    Migration(
+        3,
+        "full-text search",
+        [
+            sql("ALTER TABLE entries ADD COLUMN IF NOT EXISTS search_vector tsvector"),
+            backfill(
+                "UPDATE entries SET search_vector ="
+                f" setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig,"
+                " coalesce(title, '')), 'A') ||"
+                f" setweight(to_tsvector('{SEARCH_CONFIG}'::regconfig,"
+                " coalesce(content, '')), 'B')"
+                " WHERE id IN (SELECT id FROM entries WHERE search_vector IS NULL"
+                " LIMIT :batch FOR UPDATE SKIP LOCKED)"
+            ),
+            create_index_concurrently(
+                "ix_entries_search_vector", "ON entries USING gin (search_vector)"
+            ),
+        ],
+        transactional=False,
+    ),
+    Migration(
+        4,
+        "chunked documents",
+        [
+            sql(
+                "ALTER TABLE entries"
+                " ADD COLUMN IF NOT EXISTS chunk_count INTEGER NOT NULL DEFAULT 0,"
+                " ADD COLUMN IF NOT EXISTS length INTEGER",
+                "CREATE TABLE IF NOT EXISTS entry_chunks ("
+                " entry_id INTEGER NOT NULL REFERENCES entries (id) ON DELETE CASCADE,"
+                " seq INTEGER NOT NULL,"
+                " start INTEGER NOT NULL,"
+                " length INTEGER NOT NULL,"
+                " content TEXT NOT NULL,"
+                " PRIMARY KEY (entry_id, seq))",
+            )
+        ],
+    ),
+    Migration(
+        5,
+        "compressed content",
+        [
+            sql(
+                "ALTER TABLE entries"
+                " ADD COLUMN IF NOT EXISTS content_z BYTEA,"
+                " ADD COLUMN IF NOT EXISTS compression VARCHAR(16)"
+            )
+        ],
+    ),
+    Migration(
+        6,
+        "entry and library versions",
+        [
+            # Constant defaults: metadata-only on PostgreSQL 11+, no rewrite
+            sql(
+                "ALTER TABLE entries"
+                " ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1",
+                "ALTER TABLE users"
+                " ADD COLUMN IF NOT EXISTS library_version INTEGER NOT NULL DEFAULT 0",
+            )
+        ],
+    ),
+]
+
+LATEST = MIGRATIONS[-1].version
@@ -1,3 +1,4 @@
 from .base import Base
 from .user import Users
 from .entry import Entries
+from .chunk import EntryChunks
@@ -0,0 +1,22 @@
+from sqlalchemy import ForeignKey, Integer, Text
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm.base import Mapped
+from app.models.base import Base
+
+
+class EntryChunks(Base):
+    """
+    Ordered pieces of a long document. `start` is the character offset of the
+    chunk within the document and `length` its size in characters, so a range
+    can be located without reading any content.
+    """
+
+    __tablename__ = "entry_chunks"
+
+    entry_id: Mapped[int] = mapped_column(
+        ForeignKey("entries.id", ondelete="CASCADE"), primary_key=True
+    )
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    start: Mapped[int] = mapped_column(Integer, nullable=False)
+    length: Mapped[int] = mapped_column(Integer, nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
@@ -1,9 +1,10 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, func, ForeignKey
+from sqlalchemy import Index, LargeBinary, String, func, ForeignKey
 from sqlalchemy.orm import declarative_base, mapped_column, relationship
 from sqlalchemy.orm.base import Mapped
 from sqlalchemy.types import DateTime
 from app.models.base import Base
+from app.models.search import SearchVectorType
 
 if TYPE_CHECKING:
     from app.models.user import Users
@@ -11,17 +12,36 @@ if TYPE_CHECKING:
 
 class Entries(Base):
     __tablename__ = "entries"
+    __table_args__ = (
+        # Keyset pagination of a user's library; also serves plain user_id lookups
+        Index("ix_entries_user_created_id", "user_id", "created_at", "id"),
+        Index(
+            "ix_entries_search_vector", "search_vector", postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     title: Mapped[str] = mapped_column(String(1200))
     content: Mapped[str] = mapped_column(String(10000), nullable=False)
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # Part of the GET /entries/{id} ETag; bump on any change to the entry
+    version: Mapped[int] = mapped_column(default=1, server_default="1")
+    # Compressed storage (see app.compression): content is then empty and
+    # the text lives in content_z
+    content_z: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    compression: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    # Long documents keep `content` empty and live in entry_chunks instead
+    chunk_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    length: Mapped[int | None] = mapped_column(nullable=True)
+    # Full-text search document, see app.models.search.SearchVector
+    search_vector: Mapped[str | None] = mapped_column(
+        SearchVectorType, nullable=True, deferred=True
+    )
 
     user: Mapped["Users"] = relationship(back_populates="entries", passive_deletes=True)
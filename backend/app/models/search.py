@@ -0,0 +1,78 @@
+import os
+import re
+
+from sqlalchemy import Text, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+# Text search configuration; "simple" works for every language the voices speak
+SEARCH_CONFIG = os.getenv("SEARCH_CONFIG", "simple")
+if not re.fullmatch(r"[a-z_]+", SEARCH_CONFIG):
+    raise ValueError(f"Invalid SEARCH_CONFIG: {SEARCH_CONFIG}")
+
+# tsvector on PostgreSQL; other dialects (e.g. SQLite in local runs) get an
+# unused, always-NULL text column
+SearchVectorType = Text().with_variant(TSVECTOR(), "postgresql")
+
+
+def search_config():
+    return literal_column(f"'{SEARCH_CONFIG}'::regconfig")
+
+
+class SearchVector(FunctionElement):
+    """
+    SQL for the search document of an entry: the title weighted above the
+    content. Written by the application next to the text it indexes.
+    """
+
+    type = SearchVectorType
+    inherit_cache = True
+    name = "search_vector"
+
+
+@compiles(SearchVector, "postgresql")
+def _search_vector_pg(element, compiler, **kw):
+    title, content = list(element.clauses)
+    config = f"'{SEARCH_CONFIG}'::regconfig"
+    return (
+        f"setweight(to_tsvector({config}, coalesce({compiler.process(title, **kw)}, '')), 'A')"
+        f" || setweight(to_tsvector({config}, coalesce({compiler.process(content, **kw)}, '')), 'B')"
+    )
+
+
+@compiles(SearchVector)
+def _search_vector_default(element, compiler, **kw):
+    return "NULL"
+
+
+# Size past which a document's search vector stops growing; PostgreSQL refuses
+# tsvectors over 1MB and a few hundred KB covers the vocabulary of a long book
+SEARCH_VECTOR_MAX_BYTES = 512 * 1024
+
+
+class AppendSearchText(FunctionElement):
+    """
+    SQL that extends a search document with more content text, for entries
+    whose text arrives in pieces. Stops growing at SEARCH_VECTOR_MAX_BYTES.
+    """
+
+    type = SearchVectorType
+    inherit_cache = True
+    name = "append_search_text"
+
+
+@compiles(AppendSearchText, "postgresql")
+def _append_search_text_pg(element, compiler, **kw):
+    vector, content = (compiler.process(c, **kw) for c in element.clauses)
+    config = f"'{SEARCH_CONFIG}'::regconfig"
+    return (
+        f"CASE WHEN pg_column_size({vector}) < {SEARCH_VECTOR_MAX_BYTES}"
+        f" THEN {vector} || setweight(to_tsvector({config}, {content}), 'B')"
+        f" ELSE {vector} END"
+    )
+
+
+@compiles(AppendSearchText)
+def _append_search_text_default(element, compiler, **kw):
+    return "NULL"
@@ -18,6 +18,8 @@ class Users(Base):
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
+    # Bumped whenever an entry is added or removed; the /entries/list/me ETag
+    library_version: Mapped[int] = mapped_column(default=0, server_default="0")
 
     # One to many entries
     entries: Mapped[List["Entries"]] = relationship(
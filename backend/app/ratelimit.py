@@ -0,0 +1,334 @@
+import asyncio
+import math
+import os
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator
+
+from fastapi import HTTPException, Request
+
+from app.metrics import synthesis_rate_limited
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", "/tmp/vocodex/ratelimit.sqlite3")
+# Per user; 0 disables a limit
+SYNTHESIS_REQUESTS_PER_MINUTE = int(os.getenv("SYNTHESIS_REQUESTS_PER_MINUTE", "120"))
+SYNTHESIS_CHARS_PER_MINUTE = int(os.getenv("SYNTHESIS_CHARS_PER_MINUTE", "60000"))
+SYNTHESIS_USER_CONCURRENCY = int(os.getenv("SYNTHESIS_USER_CONCURRENCY", "6"))
+# A slot whose holder died (worker killed mid-stream) frees itself after this
+SYNTHESIS_SLOT_TTL = float(os.getenv("SYNTHESIS_SLOT_TTL", "300"))
+
+
+class RateLimited(Exception):
+    def __init__(self, limit: str, retry_after: float):
+        self.limit = limit
+        self.retry_after = retry_after
+
+    def headers(self) -> dict[str, str]:
+        return {"Retry-After": str(max(1, math.ceil(self.retry_after)))}
+
+
+@dataclass
+class Bucket:
+    """`cost` tokens out of a bucket holding `capacity`, refilled per second."""
+
+    key: str
+    cost: float
+    capacity: float
+    per_second: float
+
+    def refill(self, tokens: float, updated: float, now: float) -> float:
+        return min(self.capacity, tokens + (now - updated) * self.per_second)
+
+    def wait(self, tokens: float) -> float:
+        return (self.cost - tokens) / self.per_second
+
+
+class LimitStore(ABC):
+    """
+    Token buckets and concurrency slots. `take` is all or nothing: either
+    every bucket pays its cost, or none does and the seconds until they all
+    could is returned.
+    """
+
+    @abstractmethod
+    async def take(self, buckets: list[Bucket]) -> float:
+        ...
+
+    @abstractmethod
+    async def acquire(self, key: str, limit: int, ttl: float) -> str | None:
+        """A slot id, or None if `limit` unexpired slots are held for `key`."""
+        ...
+
+    @abstractmethod
+    async def release(self, key: str, slot: str) -> None:
+        ...
+
+
+class MemoryLimitStore(LimitStore):
+    """Limits of this process only: with N workers a user gets N times them."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._slots: dict[str, dict[str, float]] = {}
+
+    def _prune(self, now: float) -> None:
+        # Buckets refill within a minute, and a full bucket is no bucket at all
+        for key, (tokens, updated) in list(self._buckets.items()):
+            if now - updated > 60:
+                del self._buckets[key]
+
+    async def take(self, buckets: list[Bucket]) -> float:
+        now = time.time()
+        if len(self._buckets) > self.max_keys:
+            self._prune(now)
+        levels = []
+        wait = 0.0
+        for bucket in buckets:
+            tokens, updated = self._buckets.get(bucket.key, (bucket.capacity, now))
+            tokens = bucket.refill(tokens, updated, now)
+            levels.append(tokens)
+            if tokens < bucket.cost:
+                wait = max(wait, bucket.wait(tokens))
+        if wait:
+            return wait
+        for bucket, tokens in zip(buckets, levels):
+            self._buckets[bucket.key] = (tokens - bucket.cost, now)
+        return 0.0
+
+    async def acquire(self, key: str, limit: int, ttl: float) -> str | None:
+        now = time.time()
+        held = self._slots.setdefault(key, {})
+        for slot, expires in list(held.items()):
+            if expires <= now:
+                del held[slot]
+        if len(held) >= limit:
+            return None
+        slot = uuid.uuid4().hex
+        held[slot] = now + ttl
+        return slot
+
+    async def release(self, key: str, slot: str) -> None:
+        held = self._slots.get(key)
+        if held is not None:
+            held.pop(slot, None)
+            if not held:
+                del self._slots[key]
+
+
+class SqliteLimitStore(LimitStore):
+    """
+    Limits in a local SQLite file, shared by every API worker on the host.
+    Each operation is one BEGIN IMMEDIATE transaction, so concurrent workers
+    never both spend the same tokens.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+                """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS slots (
+                    id TEXT PRIMARY KEY,
+                    key TEXT NOT NULL,
+                    expires REAL NOT NULL
+                )
+                """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_slots_key ON slots (key)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly where needed
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _take(self, buckets: list[Bucket]) -> float:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            levels = []
+            wait = 0.0
+            for bucket in buckets:
+                row = conn.execute(
+                    "SELECT tokens, updated FROM buckets WHERE key = ?", (bucket.key,)
+                ).fetchone()
+                tokens = bucket.refill(*row, now) if row else bucket.capacity
+                levels.append(tokens)
+                if tokens < bucket.cost:
+                    wait = max(wait, bucket.wait(tokens))
+            if wait:
+                conn.execute("ROLLBACK")
+                return wait
+            conn.executemany(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "tokens = excluded.tokens, updated = excluded.updated",
+                [
+                    (bucket.key, tokens - bucket.cost, now)
+                    for bucket, tokens in zip(buckets, levels)
+                ],
+            )
+            conn.execute("COMMIT")
+            return 0.0
+        finally:
+            conn.close()
+
+    def _acquire(self, key: str, limit: int, ttl: float) -> str | None:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM slots WHERE key = ? AND expires <= ?", (key, now))
+            (held,) = conn.execute(
+                "SELECT count(*) FROM slots WHERE key = ?", (key,)
+            ).fetchone()
+            if held >= limit:
+                conn.execute("ROLLBACK")
+                return None
+            slot = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO slots (id, key, expires) VALUES (?, ?, ?)",
+                (slot, key, now + ttl),
+            )
+            conn.execute("COMMIT")
+            return slot
+        finally:
+            conn.close()
+
+    def _release(self, slot: str) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM slots WHERE id = ?", (slot,))
+        finally:
+            conn.close()
+
+    async def take(self, buckets: list[Bucket]) -> float:
+        return await asyncio.to_thread(self._take, buckets)
+
+    async def acquire(self, key: str, limit: int, ttl: float) -> str | None:
+        return await asyncio.to_thread(self._acquire, key, limit, ttl)
+
+    async def release(self, key: str, slot: str) -> None:
+        await asyncio.to_thread(self._release, slot)
+
+
+class SynthesisLimiter:
+    """
+    Per-user synthesis limits: requests and characters per minute as token
+    buckets (a full minute's worth may be spent in one burst), and at most
+    `max_concurrent` renders or streams at a time.
+    """
+
+    def __init__(
+        self,
+        store: LimitStore,
+        requests_per_minute: int,
+        chars_per_minute: int,
+        max_concurrent: int,
+        slot_ttl: float,
+    ):
+        self.store = store
+        self.requests_per_minute = requests_per_minute
+        self.chars_per_minute = chars_per_minute
+        self.max_concurrent = max_concurrent
+        self.slot_ttl = slot_ttl
+
+    async def charge(self, user_id: int, chars: int) -> None:
+        buckets = []
+        if self.requests_per_minute:
+            rate = self.requests_per_minute
+            buckets.append(Bucket(f"requests:{user_id}", 1, rate, rate / 60))
+        if self.chars_per_minute:
+            rate = self.chars_per_minute
+            # Never affordable, however long the caller waits: refuse it outright
+            # rather than let one request spend more than the whole quota
+            if chars > rate:
+                synthesis_rate_limited.inc("size")
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Text longer than the {rate} characters per minute quota",
+                )
+            buckets.append(Bucket(f"chars:{user_id}", chars, rate, rate / 60))
+        if not buckets:
+            return
+        wait = await self.store.take(buckets)
+        if wait:
+            synthesis_rate_limited.inc("rate")
+            raise RateLimited("rate", wait)
+
+    async def acquire(self, user_id: int) -> str | None:
+        if not self.max_concurrent:
+            return None
+        slot = await self.store.acquire(
+            f"concurrent:{user_id}", self.max_concurrent, self.slot_ttl
+        )
+        if slot is None:
+            synthesis_rate_limited.inc("concurrency")
+            raise RateLimited("concurrency", 1)
+        return slot
+
+    async def release(self, user_id: int, slot: str | None) -> None:
+        if slot is not None:
+            await self.store.release(f"concurrent:{user_id}", slot)
+
+    async def admit(self, user_id: int, chars: int) -> str | None:
+        """Takes a slot and charges the buckets; the slot must be released."""
+        slot = await self.acquire(user_id)
+        try:
+            await self.charge(user_id, chars)
+        except BaseException:
+            await self.release(user_id, slot)
+            raise
+        return slot
+
+    @asynccontextmanager
+    async def slot(self, user_id: int, chars: int) -> AsyncIterator[None]:
+        slot = await self.admit(user_id, chars)
+        try:
+            yield
+        finally:
+            await self.release(user_id, slot)
+
+    async def hold(
+        self, user_id: int, slot: str | None, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Streams `chunks`, keeping the slot until the last one is sent."""
+        try:
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await self.release(user_id, slot)
+
+
+def create_rate_limiter() -> SynthesisLimiter:
+    if RATE_LIMIT_BACKEND == "sqlite":
+        store = SqliteLimitStore(RATE_LIMIT_DB_PATH)
+    elif RATE_LIMIT_BACKEND == "memory":
+        store = MemoryLimitStore()
+    else:
+        # A typo must not quietly turn shared limits into per-worker ones
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {RATE_LIMIT_BACKEND}")
+    return SynthesisLimiter(
+        store,
+        SYNTHESIS_REQUESTS_PER_MINUTE,
+        SYNTHESIS_CHARS_PER_MINUTE,
+        SYNTHESIS_USER_CONCURRENCY,
+        SYNTHESIS_SLOT_TTL,
+    )
+
+
+def get_rate_limiter(request: Request) -> SynthesisLimiter:
+    return request.app.state.rate_limiter
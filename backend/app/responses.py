@@ -0,0 +1,19 @@
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def json_response(
+    model: BaseModel, status_code: int = 200, headers: dict | None = None
+) -> Response:
+    """
+    `model` serialized by pydantic-core straight to bytes. Returning a
+    Response skips FastAPI's own pass over the result (re-validation against
+    `response_model`, then jsonable_encoder and json.dumps on FastAPI versions
+    without a Rust path); keep `response_model` on the route for the schema.
+    """
+    return Response(
+        model.__pydantic_serializer__.to_json(model),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -2,8 +2,15 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from ..db import get_session
 from ..models.user import Users
-from ..schemas.authSchemas import RegisterIn, LoginIn, UserOut, TokenOut
+from ..schemas.authSchemas import (
+    RegisterIn,
+    LoginIn,
+    UserOut,
+    TokenOut,
+    UserCacheStatsOut,
+)
 from ..deps import get_current_user
+from ..userCache import CurrentUser, user_cache
 
 from app.controllers import authController
 
@@ -34,5 +41,10 @@ async def login(data: LoginIn, session: AsyncSession = Depends(get_session)):
 
 
 @router.get("/me", response_model=UserOut)
-async def me(user: Users = Depends(get_current_user)):
+async def me(user: CurrentUser = Depends(get_current_user)):
     return UserOut(id=user.id, username=user.username)
+
+
+@router.get("/cache/stats", response_model=UserCacheStatsOut)
+async def cacheStats():
+    return UserCacheStatsOut(**user_cache.stats())
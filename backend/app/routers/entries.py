@@ -1,29 +1,147 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio.session import AsyncSession
+import os
+from typing import AsyncIterator
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+)
+from fastapi.responses import StreamingResponse
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.db import get_session
+from app.db import get_session, get_sessionmaker
 from app.deps import get_current_user
-from app.models.user import Users
+from app.etag import etag_matches, not_modified
+from app.userCache import CurrentUser
+from app.responses import json_response
 from app.schemas.entriesSchemas import (
+    BulkUploadOut,
+    EntryOut,
     ListEntriesOut,
+    SearchEntriesOut,
+    UploadDocumentOut,
     UploadTextIn,
     UploadTextOut,
 )
 
-from app.controllers import entriesController
+from app.controllers import TTSController, entriesController
+from app.tts.blobs import blob_response
+from app.tts.store import EntryAudioStore, get_entry_audio_store
+from app.tts.voices import VoiceCatalog, get_voice_catalog, require_voice
+
+ENTRY_PRERENDER = os.getenv("ENTRY_PRERENDER", "1") == "1"
 
 router = APIRouter(prefix="/entries", tags=["entries"])
 
 
-@router.get("/{entry_id}", status_code=200)
+# Declared before /{entry_id} so "search" is not taken for an id
+@router.get("/search", status_code=200, response_model=SearchEntriesOut)
+async def searchEntries(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        return await entriesController.searchEntries(
+            q, current_user, session, limit, offset
+        )
+    except Exception:
+        raise
+
+
+# Declared before /{entry_id} so "export" is not taken for an id
+@router.get("/export", status_code=200)
+async def exportEntries(
+    format: str = Query("ndjson", pattern="^(ndjson|zip)$"),
+    current_user: CurrentUser = Depends(get_current_user),
+    sessionmaker: async_sessionmaker[AsyncSession] = Depends(get_sessionmaker),
+    store: EntryAudioStore = Depends(get_entry_audio_store),
+):
+    try:
+        body = entriesController.exportEntries(
+            current_user, format, sessionmaker, store
+        )
+        media_type = "application/zip" if format == "zip" else "application/x-ndjson"
+        return StreamingResponse(
+            body,
+            media_type=media_type,
+            headers={
+                "Content-Disposition": f'attachment; filename="vocodex-export.{format}"'
+            },
+        )
+    except Exception:
+        raise
+
+
+@router.get("/{entry_id}", status_code=200, response_model=EntryOut)
 async def getEntryById(
     entry_id: int,
-    current_user: Users = Depends(get_current_user),
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ):
     try:
+        # Revalidation only reads the version column, never the content
+        if "if-none-match" in request.headers:
+            version = await entriesController.entryVersion(
+                entry_id, current_user, session
+            )
+            etag = entriesController.entryETag(entry_id, version)
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
         entry = await entriesController.getEntryById(entry_id, current_user, session)
-        return entry
+        etag = entriesController.entryETag(entry.id, entry.version)
+        return json_response(entry, headers={"ETag": etag})
+    except Exception:
+        raise
+
+
+@router.get("/{entry_id}/content", status_code=200)
+async def getEntryContent(
+    entry_id: int,
+    start: int = Query(0, ge=0),
+    end: int | None = Query(None, ge=0),
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    sessionmaker: async_sessionmaker[AsyncSession] = Depends(get_sessionmaker),
+):
+    try:
+        text = await entriesController.streamEntryContent(
+            entry_id, start, end, current_user, session, sessionmaker
+        )
+        return StreamingResponse(text, media_type="text/plain; charset=utf-8")
+    except Exception:
+        raise
+
+
+@router.get("/{entry_id}/audio", status_code=200)
+async def getEntryAudio(
+    entry_id: int,
+    voice: str = TTSController.DEFAULT_VOICE,
+    rate: str = Query(TTSController.DEFAULT_RATE, pattern=r"^[+-]\d+%$"),
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+    store: EntryAudioStore = Depends(get_entry_audio_store),
+    catalog: VoiceCatalog = Depends(get_voice_catalog),
+):
+    await require_voice(catalog, voice)
+    try:
+        key = await entriesController.getEntryAudio(
+            entry_id, voice, rate, current_user, session, store
+        )
+        return blob_response(
+            store.blobs, key, media_type="audio/mpeg", filename=f"entry-{entry_id}.mp3"
+        )
+    except FileNotFoundError:
+        # Deleted along with its entry since the lookup
+        raise HTTPException(status_code=404, detail="Entry not found")
     except Exception:
         raise
 
@@ -31,25 +149,178 @@ async def getEntryById(
 @router.post("/text", status_code=201)
 async def uploadText(
     data: UploadTextIn,
-    current_user: Users = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+    store: EntryAudioStore = Depends(get_entry_audio_store),
 ):
     try:
         entry = await entriesController.uploadText(data, current_user, session)
+        if ENTRY_PRERENDER:
+            store.prepare(entry.id)
+            background_tasks.add_task(
+                TTSController.prerender_entry, entry.id, data.content, store
+            )
         # Return new id
         return UploadTextOut(id=entry.id)
     except Exception:
         raise
 
 
-@router.get("/list/me", status_code=200)
+@router.post("/bulk", status_code=200, response_model=BulkUploadOut)
+async def bulkUpload(
+    request: Request,
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    # NDJSON body, parsed as it streams in; imports are not pre-rendered
+    try:
+        return await entriesController.bulkUpload(
+            request.stream(), current_user, session
+        )
+    except Exception:
+        raise
+
+
+# Room for the multipart envelope around the file: boundaries, part headers
+# and any small fields sent along with it
+DOCUMENT_FORM_OVERHEAD = 64 * 1024
+
+
+def tooLarge(received: int, limit: int) -> None:
+    if received > limit:
+        raise HTTPException(status_code=413, detail="Document too large")
+
+
+async def multipartFile(request: Request, field: str) -> AsyncIterator[bytes]:
+    """
+    The contents of the `field` file part of a multipart/form-data body,
+    parsed as the body arrives. Nothing is spooled, so the size cap is
+    enforced while reading rather than after the whole upload is on disk.
+    """
+    _, options = parse_options_header(request.headers["content-type"])
+    boundary = options.get(b"boundary")
+    if not boundary:
+        raise HTTPException(status_code=400, detail="Missing multipart boundary")
+
+    parts: list[bytes] = []
+    headers: dict[bytes, bytes] = {}
+    header_field = header_value = b""
+    wanted = found = False
+
+    def on_part_begin() -> None:
+        headers.clear()
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        nonlocal header_field
+        header_field += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        nonlocal header_value
+        header_value += data[start:end]
+
+    def on_header_end() -> None:
+        nonlocal header_field, header_value
+        headers[header_field.lower()] = header_value
+        header_field = header_value = b""
+
+    def on_headers_finished() -> None:
+        nonlocal wanted, found
+        _, disposition = parse_options_header(headers.get(b"content-disposition"))
+        wanted = (
+            not found
+            and disposition.get(b"name") == field.encode()
+            and b"filename" in disposition
+        )
+        found = found or wanted
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if wanted:
+            parts.append(data[start:end])
+
+    def on_part_end() -> None:
+        nonlocal wanted
+        wanted = False
+
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        },
+    )
+    received = 0
+    async for data in request.stream():
+        received += len(data)
+        tooLarge(
+            received, entriesController.DOCUMENT_MAX_BYTES + DOCUMENT_FORM_OVERHEAD
+        )
+        try:
+            parser.write(data)
+        except MultipartParseError:
+            raise HTTPException(status_code=400, detail="Malformed multipart body")
+        for part in parts:
+            yield part
+        parts.clear()
+    parser.finalize()
+    if not found:
+        raise HTTPException(status_code=400, detail="Missing file field")
+
+
+def documentBody(request: Request) -> AsyncIterator[bytes]:
+    # Both kinds of body are read straight from the socket; uploadDocument
+    # counts the document bytes against DOCUMENT_MAX_BYTES as they arrive
+    multipart = request.headers.get("content-type", "").startswith(
+        "multipart/form-data"
+    )
+    # A declared length over the cap is refused before anything is read
+    length = request.headers.get("content-length", "")
+    if length.isdigit():
+        limit = entriesController.DOCUMENT_MAX_BYTES
+        tooLarge(int(length), limit + DOCUMENT_FORM_OVERHEAD if multipart else limit)
+    if multipart:
+        return multipartFile(request, "file")
+    return request.stream()
+
+
+@router.post("/document", status_code=201, response_model=UploadDocumentOut)
+async def uploadDocument(
+    request: Request,
+    title: str = Query(min_length=1, max_length=1200),
+    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+):
+    try:
+        return await entriesController.uploadDocument(
+            title, documentBody(request), current_user, session
+        )
+    except Exception:
+        raise
+
+
+@router.get("/list/me", status_code=200, response_model=ListEntriesOut)
 async def listEntries(
-    current_user: Users = Depends(get_current_user),
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> ListEntriesOut:
+):
     try:
-        entries = await entriesController.listEntries(current_user, session)
-        return ListEntriesOut(entries=entries)
+        version = await entriesController.libraryVersion(session, current_user.id)
+        etag = entriesController.listingETag(current_user.id, version, limit, cursor)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        listing = await entriesController.listEntries(
+            current_user, session, limit, cursor
+        )
+        return json_response(listing, headers={"ETag": etag})
     except Exception:
         raise
 
@@ -57,10 +328,11 @@ async def listEntries(
 @router.delete("/{entry_id}", status_code=204)
 async def deleteEntryById(
     entry_id: int,
-    current_user: Users = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+    store: EntryAudioStore = Depends(get_entry_audio_store),
 ):
     try:
-        await entriesController.deleteEntryById(entry_id, current_user, session)
+        await entriesController.deleteEntryById(entry_id, current_user, session, store)
     except Exception:
         raise
@@ -1,17 +1,190 @@
-import os
-from fastapi import APIRouter, BackgroundTasks
-from fastapi.responses import FileResponse
-from app.schemas.synthesisSchemas import SynthesisIn
+from fastapi import APIRouter, Depends, HTTPException, Path, Response
+from fastapi.responses import StreamingResponse
+from app.schemas.synthesisSchemas import (
+    AudioCacheStatsOut,
+    JobOut,
+    SynthesisIn,
+    VoiceOut,
+    VoicesOut,
+)
 from app.controllers import TTSController
+from app.deps import get_current_user
+from app.jobs import Job, JobQueue, QueueFull, get_job_queue
+from app.userCache import CurrentUser
+from app.ratelimit import SynthesisLimiter, get_rate_limiter
+from app.jobs.queue import DONE
+from app.tts.blobs import blob_response
+from app.tts.cache import AudioCache, get_audio_cache
+from app.tts.voices import (
+    VoiceCatalog,
+    VoicesUnavailable,
+    get_voice_catalog,
+    require_voice,
+)
 
 router = APIRouter(prefix="/synthesis", tags=["synthesis"])
 
 
+async def checked(
+    data: SynthesisIn, catalog: VoiceCatalog = Depends(get_voice_catalog)
+) -> SynthesisIn:
+    await require_voice(catalog, data.voice)
+    return data
+
+
+@router.get("/voices", response_model=VoicesOut)
+async def listVoices(
+    response: Response,
+    locale: str | None = None,
+    gender: str | None = None,
+    catalog: VoiceCatalog = Depends(get_voice_catalog),
+):
+    try:
+        voices = await catalog.voices(locale, gender)
+    except VoicesUnavailable:
+        raise HTTPException(status_code=503, detail="Voice list unavailable")
+    response.headers["Cache-Control"] = "public, max-age=3600"
+    return VoicesOut(
+        voices=[
+            VoiceOut(
+                name=v.name,
+                locale=v.locale,
+                gender=v.gender,
+                friendly_name=v.friendly_name,
+            )
+            for v in voices
+        ]
+    )
+
+
 @router.post("/GET", status_code=200)
 async def speak(
-    data: SynthesisIn,
-    background_task: BackgroundTasks,
+    data: SynthesisIn = Depends(checked),
+    user: CurrentUser = Depends(get_current_user),
+    cache: AudioCache = Depends(get_audio_cache),
+    limiter: SynthesisLimiter = Depends(get_rate_limiter),
+):
+    async with limiter.slot(user.id, len(data.text)):
+        key, hit = await TTSController.speak(data.text, data.voice, cache, data.rate)
+        try:
+            return speakResponse(cache, key, hit)
+        except FileNotFoundError:
+            # Evicted between the hit and now: a miss after all
+            key, hit = await TTSController.speak(
+                data.text, data.voice, cache, data.rate
+            )
+            return speakResponse(cache, key, hit)
+
+
+def speakResponse(cache: AudioCache, key: str, hit: bool):
+    # Content-Location is a GET-able, seekable URL for the same audio
+    return blob_response(
+        cache.store,
+        key,
+        media_type="audio/mpeg",
+        filename="output.mp3",
+        headers={
+            "X-Cache": "HIT" if hit else "MISS",
+            "Content-Location": f"{router.prefix}/audio/{key}",
+        },
+    )
+
+
+@router.get("/audio/{key}", status_code=200)
+async def getAudio(
+    key: str = Path(pattern=r"^[0-9a-f]{64}$"),
+    cache: AudioCache = Depends(get_audio_cache),
+):
+    # Content-addressed, so the URL never changes meaning: cache for good
+    try:
+        if cache.get(key) is None:
+            raise FileNotFoundError(key)
+        return blob_response(
+            cache.store,
+            key,
+            media_type="audio/mpeg",
+            headers={"Cache-Control": "public, max-age=31536000, immutable"},
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+
+@router.post("/stream", status_code=200)
+async def stream(
+    data: SynthesisIn = Depends(checked),
+    user: CurrentUser = Depends(get_current_user),
+    limiter: SynthesisLimiter = Depends(get_rate_limiter),
 ):
-    path = await TTSController.speak(data.text, data.voice)
-    background_task.add_task(os.remove, path)
-    return FileResponse(path, media_type="audio/mpeg", filename="output.mp3")
+    # The slot is held until the last chunk is sent, not just until here
+    slot = await limiter.admit(user.id, len(data.text))
+    try:
+        # Nothing touches the disk here: chunks go from the engine to the socket
+        chunks = await TTSController.open_stream(data.text, data.voice, data.rate)
+    except BaseException:
+        await limiter.release(user.id, slot)
+        raise
+    return StreamingResponse(
+        limiter.hold(user.id, slot, chunks),
+        media_type="audio/mpeg",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+@router.post("/jobs", status_code=202, response_model=JobOut)
+async def submitJob(
+    data: SynthesisIn = Depends(checked),
+    user: CurrentUser = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue),
+    limiter: SynthesisLimiter = Depends(get_rate_limiter),
+):
+    # Workers bound how many jobs run; the buckets bound how many get queued
+    await limiter.charge(user.id, len(data.text))
+    try:
+        job = await queue.submit(data.text, data.voice, data.rate, user.id)
+    except QueueFull:
+        raise HTTPException(
+            status_code=429,
+            detail="Synthesis queue is full",
+            headers={"Retry-After": "5"},
+        )
+    return JobOut(id=job.id, status=job.status)
+
+
+async def owned_job(
+    job_id: str,
+    user: CurrentUser = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue),
+) -> Job:
+    # Someone else's job is reported as missing, not as forbidden
+    job = await queue.get(job_id)
+    if job is None or job.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=JobOut)
+async def getJob(job: Job = Depends(owned_job)):
+    return JobOut(id=job.id, status=job.status, error=job.error)
+
+
+@router.get("/jobs/{job_id}/result", status_code=200)
+async def getJobResult(
+    job: Job = Depends(owned_job),
+    cache: AudioCache = Depends(get_audio_cache),
+):
+    if job.status != DONE or job.result_key is None:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    try:
+        if cache.get(job.result_key) is None:
+            raise FileNotFoundError(job.result_key)
+        return blob_response(
+            cache.store, job.result_key, media_type="audio/mpeg", filename="output.mp3"
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=410, detail="Job result expired")
+
+
+@router.get("/cache/stats", response_model=AudioCacheStatsOut)
+async def cacheStats(cache: AudioCache = Depends(get_audio_cache)):
+    return AudioCacheStatsOut(**cache.stats())
@@ -19,3 +19,12 @@ class UserOut(BaseModel):
 class TokenOut(BaseModel):
     token: str
     token_type: str = "bearer"
+
+
+class UserCacheStatsOut(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    entries: int
+    max_size: int
+    ttl_seconds: float
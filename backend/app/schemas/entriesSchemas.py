@@ -11,6 +11,23 @@ class UploadTextOut(BaseModel):
     id: int
 
 
+class EntryOut(BaseModel):
+    id: int
+    user_id: int
+    title: str
+    content: str
+    created_at: datetime
+    chunk_count: int
+    length: int | None = None
+    version: int
+
+
+class UploadDocumentOut(BaseModel):
+    id: int
+    length: int
+    chunks: int
+
+
 class EntrySummary(BaseModel):
     id: int
     title: str
@@ -19,3 +36,28 @@ class EntrySummary(BaseModel):
 
 class ListEntriesOut(BaseModel):
     entries: list[EntrySummary]
+    next_cursor: str | None = None
+
+
+class BulkLineError(BaseModel):
+    line: int
+    error: str
+
+
+class BulkUploadOut(BaseModel):
+    inserted: int
+    failed: int
+    errors: list[BulkLineError]
+
+
+class SearchResult(BaseModel):
+    id: int
+    title: str
+    date: datetime
+    rank: float
+    snippet: str
+
+
+class SearchEntriesOut(BaseModel):
+    results: list[SearchResult]
+    next_offset: int | None = None
@@ -1,6 +1,34 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class SynthesisIn(BaseModel):
     text: str
     voice: str
+    rate: str = Field(default="+0%", pattern=r"^[+-]\d+%$")
+
+
+class AudioCacheStatsOut(BaseModel):
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class JobOut(BaseModel):
+    id: str
+    status: str
+    error: str | None = None
+
+
+class VoiceOut(BaseModel):
+    name: str
+    locale: str
+    gender: str
+    friendly_name: str
+
+
+class VoicesOut(BaseModel):
+    voices: list[VoiceOut]
@@ -1,16 +1,51 @@
-import os, time, bcrypt, jwt
+import asyncio, os, time, bcrypt, jwt
+from concurrent.futures import ThreadPoolExecutor
+
+from app.metrics import password_hash_duration
 
 JWT_SECRET = os.getenv("JWT_SECRET", "dev-only-change-me")
 JWT_EXPIRES = int(os.getenv("JWT_EXPIRES", "3600"))
 ALGO = "HS256"
 
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+# bcrypt releases the GIL, so a few threads hash in parallel without ever
+# blocking the event loop; the bound keeps a login spike from eating all CPUs
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+_hash_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+)
+
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    with password_hash_duration.time("hash"):
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed.encode())
+    with password_hash_duration.time("verify"):
+        return bcrypt.checkpw(password.encode(), hashed.encode())
+
+
+def needs_rehash(hashed: str) -> bool:
+    # "$2b$12$<salt+hash>": the cost factor is the second field
+    try:
+        return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def hash_password_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _hash_executor, verify_password, password, hashed
+    )
 
 
 def create_access_token(user_id: int, username: str) -> str:
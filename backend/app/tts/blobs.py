@@ -0,0 +1,343 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from fastapi import Response
+from fastapi.responses import FileResponse, RedirectResponse
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+BLOB_BACKEND = os.getenv("BLOB_BACKEND", "local")
+
+
+@dataclass
+class BlobInfo:
+    key: str
+    size: int
+    mtime: float
+
+
+class BlobStore(ABC):
+    """
+    Where rendered audio lives. Keys are "/"-separated; blobs sharing their
+    first segment form a group that `delete_group` removes at once (e.g. all
+    the audio of one entry).
+
+    `local_path` is what makes zero-copy, Range-aware serving possible. A
+    store that is not on local disk (an S3 stand-in) returns None there, and
+    either hands out a `url` clients are redirected to (e.g. a presigned URL;
+    object stores answer Range requests themselves) or has its blobs streamed
+    through this service with `read_range`.
+    """
+
+    def local_path(self, key: str) -> Path | None:
+        """Where the blob sits on local disk, or None for remote stores."""
+        return None
+
+    def url(self, key: str) -> str | None:
+        """A URL the client can fetch the blob from directly, if any."""
+        return None
+
+    def read_range(self, key: str, start: int, end: int) -> bytes | None:
+        """Bytes [start, end) of the blob; None if it does not exist."""
+        data = self.read(key)
+        return None if data is None else data[start:end]
+
+    @abstractmethod
+    def stat(self, key: str) -> BlobInfo | None:
+        ...
+
+    @abstractmethod
+    def touch(self, key: str) -> BlobInfo | None:
+        """Marks the blob as recently used; None if it does not exist."""
+        ...
+
+    @abstractmethod
+    def read(self, key: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    def write(self, key: str, data: bytes) -> None:
+        """Atomic: readers see the old blob or the new one, never a part."""
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    def open_group(self, group: str) -> None:
+        """
+        Called before writing a group's blobs. `write_to_group` then fails
+        with FileNotFoundError if the group was deleted in between.
+        """
+
+    def write_to_group(self, key: str, data: bytes) -> None:
+        self.write(key, data)
+
+    @abstractmethod
+    def delete_group(self, group: str) -> None:
+        ...
+
+    @abstractmethod
+    def list_group(self, group: str) -> list[BlobInfo]:
+        ...
+
+    @abstractmethod
+    def scan(self) -> Iterator[BlobInfo]:
+        ...
+
+
+class LocalBlobStore(BlobStore):
+    """
+    A directory tree. Each group goes under a two-level shard picked by the
+    hash of its name (root/ab/cd/<group>/...), so no directory grows past a
+    few hundred entries however many blobs there are. Content-addressed keys
+    (the audio cache) are their own group, i.e. sharded by content hash.
+    """
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _group_dir(self, group: str) -> Path:
+        if not group or group in (".", "..") or "/" in group:
+            raise ValueError(f"Invalid blob group: {group!r}")
+        shard = hashlib.sha256(group.encode()).hexdigest()
+        return self.root / shard[:2] / shard[2:4] / group
+
+    def _path(self, key: str) -> Path:
+        group, _, rest = key.partition("/")
+        if not rest:
+            return self._group_dir(group)
+        if any(part in ("", ".", "..") for part in rest.split("/")):
+            raise ValueError(f"Invalid blob key: {key!r}")
+        return self._group_dir(group) / rest
+
+    def local_path(self, key: str) -> Path | None:
+        return self._path(key)
+
+    def stat(self, key: str) -> BlobInfo | None:
+        try:
+            st = self._path(key).stat()
+        except FileNotFoundError:
+            return None
+        return BlobInfo(key, st.st_size, st.st_mtime)
+
+    def touch(self, key: str) -> BlobInfo | None:
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            return None
+        return self.stat(key)
+
+    def read(self, key: str) -> bytes | None:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, path: Path, data: bytes) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._write(path, data)
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def open_group(self, group: str) -> None:
+        self._group_dir(group).mkdir(parents=True, exist_ok=True)
+
+    def write_to_group(self, key: str, data: bytes) -> None:
+        # No mkdir: a group deleted meanwhile must stay deleted
+        self._write(self._path(key), data)
+
+    def delete_group(self, group: str) -> None:
+        shutil.rmtree(self._group_dir(group), ignore_errors=True)
+
+    def list_group(self, group: str) -> list[BlobInfo]:
+        directory = self._group_dir(group)
+        infos = []
+        for path in sorted(directory.rglob("*")):
+            if path.suffix == ".tmp" or not path.is_file():
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            key = path.relative_to(directory.parent).as_posix()
+            infos.append(BlobInfo(key, st.st_size, st.st_mtime))
+        return infos
+
+    def scan(self) -> Iterator[BlobInfo]:
+        for shard in self.root.glob("*/*"):
+            for path in shard.rglob("*"):
+                if path.suffix == ".tmp":
+                    continue
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                if path.is_file():
+                    key = path.relative_to(shard).as_posix()
+                    yield BlobInfo(key, st.st_size, st.st_mtime)
+
+
+def create_blob_store(root: str | Path) -> BlobStore:
+    if BLOB_BACKEND == "local":
+        return LocalBlobStore(root)
+    raise ValueError(f"Unknown BLOB_BACKEND: {BLOB_BACKEND}")
+
+
+def byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    The [start, end) a single-range `Range` header asks for, or None when it
+    is to be ignored (other units, several ranges, malformed). ValueError if
+    nothing of a `size`-byte blob is in it: that is a 416.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash or not (first or last):
+        return None
+    if (first and not first.isdigit()) or (last and not last.isdigit()):
+        return None
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last) + 1, size) if last else size
+    else:
+        start, end = max(size - int(last), 0), size
+    if start >= end:
+        raise ValueError(f"Unsatisfiable range: {header}")
+    return start, end
+
+
+class BlobStreamResponse(Response):
+    """
+    What FileResponse does for a file, for a blob that has none: a single
+    byte range is answered with 206 (or 416), and the body is read from the
+    store `chunk_size` bytes at a time.
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        store: BlobStore,
+        blob: BlobInfo,
+        media_type: str,
+        filename: str | None = None,
+        headers: dict | None = None,
+    ):
+        super().__init__(media_type=media_type, headers=headers)
+        self.store = store
+        self.blob = blob
+        self.headers["accept-ranges"] = "bytes"
+        if filename is not None:
+            self.headers["content-disposition"] = f'attachment; filename="{filename}"'
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        size = self.blob.size
+        start, end, status = 0, size, 200
+        header = Headers(scope=scope).get("range")
+        try:
+            requested = byte_range(header, size) if header else None
+        except ValueError:
+            self.status_code = 416
+            self.headers["content-range"] = f"bytes */{size}"
+            self.headers["content-length"] = "0"
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 416,
+                    "headers": self.raw_headers,
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if requested is not None:
+            (start, end), status = requested, 206
+            self.headers["content-range"] = f"bytes {start}-{end - 1}/{size}"
+        self.headers["content-length"] = str(end - start)
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": self.raw_headers,
+            }
+        )
+        if end == start:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        position = start
+        while position < end:
+            data = await asyncio.to_thread(
+                self.store.read_range,
+                self.blob.key,
+                position,
+                min(position + self.chunk_size, end),
+            )
+            if not data:
+                # Deleted while being sent: the length is promised already
+                raise RuntimeError(f"Blob {self.blob.key} went away mid-response")
+            position += len(data)
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": data,
+                    "more_body": position < end,
+                }
+            )
+
+
+def blob_response(
+    store: BlobStore,
+    key: str,
+    media_type: str,
+    filename: str | None = None,
+    headers: dict | None = None,
+) -> Response:
+    """
+    Serves a blob with Range / 206 Partial Content and Accept-Ranges, so
+    players can seek and downloads resume. Local files go out through
+    FileResponse, which uses the server's pathsend extension when available;
+    remote blobs are a redirect to their `url`, or else streamed from the
+    store. FileNotFoundError if the blob does not exist.
+    """
+    path = store.local_path(key)
+    if path is not None:
+        # Stat now, so a blob evicted since it was looked up surfaces here,
+        # where the caller can still act on it, not as a 500 mid-response
+        stat_result = os.stat(path)
+        return FileResponse(
+            path,
+            media_type=media_type,
+            filename=filename,
+            headers=headers,
+            stat_result=stat_result,
+        )
+    url = store.url(key)
+    if url is not None:
+        return RedirectResponse(url, status_code=307, headers=headers)
+    blob = store.stat(key)
+    if blob is None:
+        raise FileNotFoundError(key)
+    return BlobStreamResponse(store, blob, media_type, filename, headers)
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+from fastapi import Request
+
+from app.tts.blobs import BlobInfo, BlobStore, create_blob_store
+
+AUDIO_CACHE_DIR = os.getenv("AUDIO_CACHE_DIR", "/tmp/vocodex/audio-cache")
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+def normalize_text(text: str) -> str:
+    # Same words, same audio: collapse whitespace and unicode variants
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(text: str, voice: str, rate: str) -> str:
+    raw = "\0".join((voice, rate, normalize_text(text)))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class AudioCache:
+    """
+    Content-addressed MP3 cache in a blob store.
+
+    Blobs are named after `cache_key(...)`, written atomically and evicted
+    least-recently-used once the total size goes over `max_bytes`. The
+    in-memory index is rebuilt from the store on start, ordered by mtime, and
+    `get` touches the blob so recency survives restarts.
+    """
+
+    def __init__(self, store: BlobStore, max_bytes: int):
+        self.store = store
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        for blob in sorted(self.store.scan(), key=lambda blob: blob.mtime):
+            self._index[blob.key] = blob.size
+            self._size += blob.size
+        self._evict()
+
+    def get(self, key: str) -> BlobInfo | None:
+        # Another worker may have rendered it into the shared store
+        blob = self.store.touch(key)
+        if blob is None:
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if key not in self._index:
+                self._index[key] = blob.size
+                self._size += blob.size
+            self._index.move_to_end(key)
+            self.hits += 1
+        return blob
+
+    def put(self, key: str, data: bytes) -> BlobInfo:
+        self.store.write(key, data)
+
+        with self._lock:
+            self._forget(key)
+            self._index[key] = len(data)
+            self._size += len(data)
+            self._evict(keep=key)
+        return BlobInfo(key, len(data), time.time())
+
+    def _forget(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def _evict(self, keep: str | None = None) -> None:
+        while self._size > self.max_bytes and self._index:
+            key = next(iter(self._index))
+            if key == keep:
+                break
+            self._forget(key)
+            self.store.delete(key)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def migrate_flat_layout(root: str | Path, store: BlobStore) -> int:
+    """
+    Moves cache files of the layout before the blob store, root/<key>.mp3,
+    to their keys in `store`. Cheap once done (nothing matches any more), so
+    it runs on every start; several processes may run it at once.
+    """
+    moved = 0
+    for path in Path(root).glob("*.mp3"):
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            # Moved by another process meanwhile
+            continue
+        store.write(path.stem, data)
+        path.unlink(missing_ok=True)
+        moved += 1
+    for path in Path(root).glob("*.tmp"):
+        path.unlink(missing_ok=True)
+    return moved
+
+
+def create_audio_cache() -> AudioCache:
+    store = create_blob_store(AUDIO_CACHE_DIR)
+    # Before the index is built, so the moved files count towards the cap
+    migrate_flat_layout(AUDIO_CACHE_DIR, store)
+    return AudioCache(store, AUDIO_CACHE_MAX_BYTES)
+
+
+def get_audio_cache(request: Request) -> AudioCache:
+    return request.app.state.audio_cache
@@ -0,0 +1,60 @@
+import re
+
+# Sentence ends: terminal punctuation (optionally closed by quotes/brackets)
+# followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?;…。！？])[\"'”’)\]]*\s+")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+
+
+def _pieces(text: str, max_chars: int):
+    for paragraph in _PARAGRAPH.split(text):
+        for sentence in _SENTENCE_END.split(paragraph):
+            sentence = " ".join(sentence.split())
+            if not sentence:
+                continue
+            if len(sentence) <= max_chars:
+                yield sentence, False
+                continue
+            # A single run-on sentence: fall back to word boundaries
+            words = sentence.split(" ")
+            current = ""
+            for word in words:
+                while len(word) > max_chars:
+                    if current:
+                        yield current, False
+                        current = ""
+                    yield word[:max_chars], False
+                    word = word[max_chars:]
+                if current and len(current) + 1 + len(word) > max_chars:
+                    yield current, False
+                    current = word
+                else:
+                    current = f"{current} {word}" if current else word
+            if current:
+                yield current, False
+        yield "", True
+
+
+def split_text(text: str, max_chars: int) -> list[str]:
+    """
+    Splits `text` into chunks of at most `max_chars`, cutting at paragraph
+    and sentence boundaries whenever possible. Consecutive sentences are
+    packed together; a paragraph break always starts a new chunk once the
+    current one is at least half full.
+    """
+    chunks: list[str] = []
+    current = ""
+    for piece, paragraph_end in _pieces(text, max_chars):
+        if paragraph_end:
+            if len(current) >= max_chars // 2:
+                chunks.append(current)
+                current = ""
+            continue
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
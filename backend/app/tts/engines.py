@@ -0,0 +1,118 @@
+import asyncio
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from contextlib import aclosing
+from typing import AsyncIterator
+
+import edge_tts
+
+from .voices import Voice
+
+TTS_ENGINE = os.getenv("TTS_ENGINE", "edge")
+LOCAL_TTS_LATENCY = float(os.getenv("LOCAL_TTS_LATENCY", "0.05"))
+LOCAL_TTS_BYTES_PER_SECOND = int(os.getenv("LOCAL_TTS_BYTES_PER_SECOND", "0"))
+LOCAL_TTS_CHARS_PER_SECOND = float(os.getenv("LOCAL_TTS_CHARS_PER_SECOND", "15"))
+
+
+class TTSEngine(ABC):
+    """Turns text into a stream of MP3 bytes."""
+
+    name: str
+
+    @abstractmethod
+    def stream(self, text: str, voice: str, rate: str) -> AsyncIterator[bytes]:
+        ...
+
+    @abstractmethod
+    async def list_voices(self) -> list[Voice]:
+        ...
+
+
+class EdgeTTSEngine(TTSEngine):
+    name = "edge"
+
+    async def stream(self, text: str, voice: str, rate: str) -> AsyncIterator[bytes]:
+        communicate = edge_tts.Communicate(text, voice, rate=rate)
+        async with aclosing(communicate.stream()) as chunks:
+            async for chunk in chunks:
+                if chunk["type"] == "audio":
+                    yield chunk["data"]
+
+    async def list_voices(self) -> list[Voice]:
+        return [
+            Voice(v["ShortName"], v["Locale"], v["Gender"], v["FriendlyName"])
+            for v in await edge_tts.list_voices()
+        ]
+
+
+# MPEG-2 Layer III, 48 kbit/s, 24 kHz, mono: the same format edge-tts returns.
+# 144-byte frames of 576 samples (24 ms); all-zero side info decodes to silence.
+MP3_FRAME = b"\xff\xf3\x64\xc0" + bytes(140)
+MP3_FRAME_SECONDS = 576 / 24000
+
+# A few real Edge voice names, so requests valid offline are valid upstream
+LOCAL_VOICES = [
+    Voice("en-US-EmmaMultilingualNeural", "en-US", "Female", "Emma Multilingual"),
+    Voice("en-US-AriaNeural", "en-US", "Female", "Aria"),
+    Voice("en-US-GuyNeural", "en-US", "Male", "Guy"),
+    Voice("en-GB-RyanNeural", "en-GB", "Male", "Ryan"),
+    Voice("ar-EG-SalmaNeural", "ar-EG", "Female", "Salma"),
+    Voice("ar-EG-ShakirNeural", "ar-EG", "Male", "Shakir"),
+    Voice("fr-FR-DeniseNeural", "fr-FR", "Female", "Denise"),
+]
+
+
+class LocalTTSEngine(TTSEngine):
+    """
+    Offline engine for tests and load tests. Returns silent but valid MP3
+    frames whose duration follows the text length and rate, after `latency`
+    seconds and at most `bytes_per_second` (0 = unthrottled). Output is
+    deterministic: the same input always yields the same bytes.
+    """
+
+    name = "local"
+    chunk_frames = 32
+
+    def __init__(
+        self, latency: float, bytes_per_second: int, chars_per_second: float
+    ):
+        self.latency = latency
+        self.bytes_per_second = bytes_per_second
+        self.chars_per_second = chars_per_second
+
+    def frame_count(self, text: str, rate: str) -> int:
+        speed = 1 + int(rate.rstrip("%")) / 100
+        seconds = len(text) / self.chars_per_second / max(speed, 0.1)
+        return max(1, math.ceil(seconds / MP3_FRAME_SECONDS))
+
+    async def stream(self, text: str, voice: str, rate: str) -> AsyncIterator[bytes]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        started = time.perf_counter()
+        sent = 0
+        remaining = self.frame_count(text, rate)
+        while remaining:
+            frames = min(remaining, self.chunk_frames)
+            remaining -= frames
+            chunk = MP3_FRAME * frames
+            if self.bytes_per_second:
+                due = started + (sent + len(chunk)) / self.bytes_per_second
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            sent += len(chunk)
+            yield chunk
+
+    async def list_voices(self) -> list[Voice]:
+        return list(LOCAL_VOICES)
+
+
+def create_tts_engine() -> TTSEngine:
+    if TTS_ENGINE == "local":
+        return LocalTTSEngine(
+            LOCAL_TTS_LATENCY, LOCAL_TTS_BYTES_PER_SECOND, LOCAL_TTS_CHARS_PER_SECOND
+        )
+    if TTS_ENGINE == "edge":
+        return EdgeTTSEngine()
+    raise ValueError(f"Unknown TTS_ENGINE: {TTS_ENGINE}")
@@ -0,0 +1,83 @@
+import hashlib
+import os
+from pathlib import Path
+
+from fastapi import Request
+
+from app.tts.blobs import BlobStore, create_blob_store
+
+ENTRY_AUDIO_DIR = os.getenv("ENTRY_AUDIO_DIR", "/tmp/vocodex/entry-audio")
+
+
+class EntryAudioStore:
+    """
+    Rendered audio of saved entries, one blob group per entry and one blob
+    per (voice, rate). Unlike the audio cache nothing is evicted: blobs live
+    until the entry is deleted.
+    """
+
+    def __init__(self, blobs: BlobStore):
+        self.blobs = blobs
+
+    def key_for(self, entry_id: int, voice: str, rate: str) -> str:
+        # Voice comes from the client: hash it instead of using it as a name
+        name = hashlib.sha256(f"{voice}\0{rate}".encode()).hexdigest()[:32]
+        return f"{entry_id}/{name}.mp3"
+
+    def get(self, entry_id: int, voice: str, rate: str) -> str | None:
+        key = self.key_for(entry_id, voice, rate)
+        return key if self.blobs.stat(key) is not None else None
+
+    def prepare(self, entry_id: int) -> None:
+        self.blobs.open_group(str(entry_id))
+
+    def put(self, entry_id: int, voice: str, rate: str, data: bytes) -> str:
+        """
+        Raises FileNotFoundError if the entry's group is gone, i.e. the entry
+        was deleted while its audio was rendering; nothing is left behind then.
+        """
+        key = self.key_for(entry_id, voice, rate)
+        self.blobs.write_to_group(key, data)
+        return key
+
+    def delete(self, entry_id: int) -> None:
+        self.blobs.delete_group(str(entry_id))
+
+
+def migrate_entry_dirs(root: str | Path, store: BlobStore) -> int:
+    """
+    Moves entry audio of the layout before the blob store,
+    root/<entry id>/<name>.mp3, to its keys in `store` and removes the
+    emptied directories. Shard directories of the new layout hold no files
+    at that depth, so they are left alone.
+    """
+    moved = 0
+    for directory in Path(root).iterdir():
+        if not directory.name.isdigit() or not directory.is_dir():
+            continue
+        for path in directory.glob("*.mp3"):
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                continue
+            store.write(f"{directory.name}/{path.name}", data)
+            path.unlink(missing_ok=True)
+            moved += 1
+        for path in directory.glob("*.tmp"):
+            path.unlink(missing_ok=True)
+        try:
+            directory.rmdir()
+        except OSError:
+            # Not empty: a shard of the new layout with the same name
+            pass
+    return moved
+
+
+def create_entry_audio_store() -> EntryAudioStore:
+    store = create_blob_store(ENTRY_AUDIO_DIR)
+    migrate_entry_dirs(ENTRY_AUDIO_DIR, store)
+    return EntryAudioStore(store)
+
+
+def get_entry_audio_store(request: Request) -> EntryAudioStore:
+    return request.app.state.entry_audio
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger("uvicorn.error")
+
+# The upstream list changes a few times a year: refresh daily, and after a
+# failed fetch try again a minute later while serving the old list
+VOICES_TTL = float(os.getenv("VOICES_TTL", "86400"))
+VOICES_RETRY = float(os.getenv("VOICES_RETRY", "60"))
+
+
+@dataclass(frozen=True)
+class Voice:
+    name: str
+    locale: str
+    gender: str
+    friendly_name: str
+
+
+class VoicesUnavailable(Exception):
+    pass
+
+
+class VoiceCatalog:
+    """
+    The engine's voices, indexed by name and by locale. The list is kept
+    `ttl` seconds; past that the stale one is still served while a single
+    background task fetches the new one, so after the first load no request
+    waits on the upstream.
+    """
+
+    def __init__(
+        self, load: Callable[[], Awaitable[list[Voice]]], ttl: float, retry: float
+    ):
+        self.load = load
+        self.ttl = ttl
+        self.retry = retry
+        self._all: list[Voice] = []
+        self._by_name: dict[str, Voice] = {}
+        self._by_locale: dict[str, list[Voice]] = {}
+        self._loaded = False
+        self._expires = 0.0
+        self._retry_at = 0.0
+        self._task: asyncio.Task | None = None
+
+    def _index(self, voices: list[Voice]) -> None:
+        voices = sorted(voices, key=lambda v: (v.locale, v.name))
+        by_locale: dict[str, list[Voice]] = {}
+        for voice in voices:
+            by_locale.setdefault(voice.locale.lower(), []).append(voice)
+        # Swapped whole, so readers never see a half-built index
+        self._all = voices
+        self._by_name = {voice.name: voice for voice in voices}
+        self._by_locale = by_locale
+        self._loaded = True
+
+    async def _reload(self) -> None:
+        try:
+            voices = await self.load()
+        except Exception:
+            logger.exception("Fetching the voice list failed")
+            self._retry_at = time.monotonic() + self.retry
+            return
+        self._index(voices)
+        self._expires = time.monotonic() + self.ttl
+
+    def refresh(self) -> asyncio.Task:
+        """Starts a background reload unless one is already running."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._reload())
+        return self._task
+
+    async def _ready(self) -> None:
+        now = time.monotonic()
+        if now >= self._expires and now >= self._retry_at:
+            self.refresh()
+        if not self._loaded:
+            if self._task is not None and not self._task.done():
+                await asyncio.shield(self._task)
+            if not self._loaded:
+                raise VoicesUnavailable()
+
+    async def get(self, name: str) -> Voice | None:
+        await self._ready()
+        return self._by_name.get(name)
+
+    async def voices(
+        self, locale: str | None = None, gender: str | None = None
+    ) -> list[Voice]:
+        await self._ready()
+        voices = self._all
+        if locale is not None:
+            voices = self._by_locale.get(locale.lower(), [])
+        if gender is not None:
+            voices = [v for v in voices if v.gender.lower() == gender.lower()]
+        return voices
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+def create_voice_catalog(engine) -> VoiceCatalog:
+    return VoiceCatalog(engine.list_voices, VOICES_TTL, VOICES_RETRY)
+
+
+def get_voice_catalog(request: Request) -> VoiceCatalog:
+    return request.app.state.voice_catalog
+
+
+async def require_voice(catalog: VoiceCatalog, name: str) -> None:
+    """
+    422 for a voice the engine doesn't have, before any synthesis starts. If
+    the list can't be fetched the voice is let through: synthesis then
+    fails on its own if it has to.
+    """
+    try:
+        voice = await catalog.get(name)
+    except VoicesUnavailable:
+        return
+    if voice is None:
+        raise HTTPException(status_code=422, detail=f"Unknown voice: {name}")
@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.models.user import Users
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """
+    The authenticated user as handlers see it: plain values read once, not a
+    live ORM row, so a cached copy is never bound to (or refreshed through)
+    some other request's session.
+    """
+
+    id: int
+    username: str | None
+
+
+async def load_user(session: AsyncSession, user_id: int) -> CurrentUser | None:
+    row = (
+        await session.execute(
+            select(Users.id, Users.username).where(Users.id == user_id)
+        )
+    ).one_or_none()
+    return CurrentUser(*row) if row is not None else None
+
+
+class UserCache:
+    """
+    Users resolved from a bearer token, keyed by (user id, token), so a valid
+    JWT needs no database round trip until the entry expires (`ttl` seconds)
+    or the user row changes in this process. Bounded to `max_size` entries,
+    least recently used first out.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[int, str], tuple[float, CurrentUser]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, token: str) -> CurrentUser | None:
+        key = (user_id, token)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None or cached[0] < time.monotonic():
+                if cached is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+
+    def put(self, user_id: int, token: str, user: CurrentUser) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[(user_id, token)] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end((user_id, token))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+        }
+
+
+user_cache = UserCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+# Invalidation. Changes are dropped from the cache right away and once more
+# after commit, so a request racing the transaction can't re-cache the old row.
+_PENDING = "user_cache_invalidate"
+
+
+def _invalidate(session: Session, user_id: int | None) -> None:
+    if user_id is None:
+        user_cache.clear()
+    else:
+        user_cache.invalidate(user_id)
+    session.info.setdefault(_PENDING, set()).add(user_id)
+
+
+@event.listens_for(Users, "after_update")
+@event.listens_for(Users, "after_delete")
+def _user_row_changed(mapper, connection, target: Users) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        _invalidate(session, target.id)
+    else:
+        user_cache.invalidate(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bulk_user_statement(state: ORMExecuteState) -> None:
+    # delete(Users)/update(Users) statements: which rows is unknown, drop all
+    if (state.is_update or state.is_delete) and any(
+        mapper.class_ is Users for mapper in state.all_mappers
+    ):
+        _invalidate(state.session, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    if None in pending:
+        user_cache.clear()
+        return
+    for user_id in pending:
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,127 @@
+"""
+Entry content storage size and read latency, plain vs zlib.
+
+    cd backend && DATABASE_URL=... python -m benchmarks.bench_compression
+
+Uploads the same --entries texts once per mode, then reports the average
+on-disk size of the stored content (pg_column_size, i.e. after PostgreSQL's
+own TOAST compression) and the latency of GET /entries/{id}.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+from sqlalchemy import delete, func, select
+
+from app import compression
+from app.models.entry import Entries
+from app.models.user import Users
+
+from .common import Timer, app_client, report, summarize
+
+WORDS = (
+    "the whale ship sea captain harpoon voyage deck mast crew sail storm "
+    "island ocean wind harbour rope lantern night morning letter chapter"
+).split()
+
+
+def make_text(rng: random.Random, chars: int) -> str:
+    words, size = [], 0
+    while size < chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return " ".join(words)[:chars]
+
+
+async def read_entries(
+    client, headers: dict, ids: list[int], reads: int, concurrency: int, rng
+) -> tuple[Timer, float]:
+    """`reads` random GET /entries/{id} over `concurrency` workers."""
+    timer = Timer()
+    remaining = reads
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            async with timer.measure():
+                resp = await client.get(f"/entries/{rng.choice(ids)}", headers=headers)
+            resp.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return timer, time.perf_counter() - started
+
+
+async def run(entries: int, chars: int, reads: int, concurrency: int) -> None:
+    rng = random.Random(7)
+    texts = [make_text(rng, chars) for _ in range(entries)]
+    username = f"bench-compression-{uuid.uuid4().hex[:8]}"
+    password = "benchmark-password"
+
+    async with app_client() as client:
+        from app.main import app
+
+        resp = await client.post(
+            "/auth/register", json={"username": username, "password": password}
+        )
+        resp.raise_for_status()
+        resp = await client.post(
+            "/auth/login", json={"username": username, "password": password}
+        )
+        headers = {"Authorization": f"Bearer {resp.json()['token']}"}
+
+        for mode in ("none", "zlib"):
+            compression.ENTRY_COMPRESSION = mode
+            ids = []
+            for text in texts:
+                resp = await client.post(
+                    "/entries/text",
+                    headers=headers,
+                    json={"title": "Bench", "content": text},
+                )
+                resp.raise_for_status()
+                ids.append(resp.json()["id"])
+
+            async with app.state.sessionmaker() as session:
+                stored = (
+                    await session.execute(
+                        select(
+                            func.avg(
+                                func.coalesce(
+                                    func.pg_column_size(Entries.content_z), 0
+                                )
+                                + func.pg_column_size(Entries.content)
+                            )
+                        ).where(Entries.id.in_(ids))
+                    )
+                ).scalar_one()
+
+            timer, elapsed = await read_entries(
+                client, headers, ids, reads, concurrency, rng
+            )
+
+            print(f"compression={mode} avg stored bytes={float(stored):.0f}")
+            report(f"GET /entries/{{id}} ({mode})", summarize(timer.samples, elapsed))
+
+        async with app.state.sessionmaker() as session:
+            await session.execute(delete(Users).where(Users.username == username))
+            await session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--chars", type=int, default=8000)
+    parser.add_argument("--reads", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    asyncio.run(run(args.entries, args.chars, args.reads, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Listing and entry read latency on a large library, and the share of it spent
+turning the page into JSON.
+
+    cd backend && DATABASE_URL=... python -m benchmarks.bench_listing
+
+Seeds one user with --entries entries through /entries/bulk, walks the whole
+library with GET /entries/list/me?limit=--page a few times, reads random
+entries with GET /entries/{id}, then times serializing one page on its own.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+
+from sqlalchemy import delete
+
+from app.controllers import entriesController
+from app.models.user import Users
+from app.responses import json_response
+from app.userCache import load_user
+
+from .common import Timer, app_client, report, summarize
+
+
+async def run(entries: int, page: int, walks: int, reads: int) -> None:
+    username = f"bench-listing-{uuid.uuid4().hex[:8]}"
+    password = "benchmark-password"
+    rng = random.Random(7)
+
+    async with app_client() as client:
+        from app.main import app
+
+        body = {"username": username, "password": password}
+        (await client.post("/auth/register", json=body)).raise_for_status()
+        resp = await client.post("/auth/login", json=body)
+        headers = {"Authorization": f"Bearer {resp.json()['token']}"}
+
+        lines = "".join(
+            json.dumps({"title": f"Entry {i}", "content": f"Benchmark entry {i}"})
+            + "\n"
+            for i in range(entries)
+        )
+        resp = await client.post("/entries/bulk", headers=headers, content=lines)
+        resp.raise_for_status()
+
+        ids = []
+        pages = Timer()
+        started = time.perf_counter()
+        for _ in range(walks):
+            cursor = None
+            while True:
+                params = {"limit": page, **({"cursor": cursor} if cursor else {})}
+                async with pages.measure():
+                    resp = await client.get(
+                        "/entries/list/me", headers=headers, params=params
+                    )
+                resp.raise_for_status()
+                data = resp.json()
+                ids.extend(entry["id"] for entry in data["entries"])
+                cursor = data["next_cursor"]
+                if cursor is None:
+                    break
+        elapsed = time.perf_counter() - started
+        report(f"GET /entries/list/me ({page})", summarize(pages.samples, elapsed))
+        print(f"whole library of {entries}: {elapsed / walks * 1000:.1f} ms")
+
+        reader = Timer()
+        started = time.perf_counter()
+        for _ in range(reads):
+            async with reader.measure():
+                resp = await client.get(f"/entries/{rng.choice(ids)}", headers=headers)
+            resp.raise_for_status()
+        report(
+            "GET /entries/{id}",
+            summarize(reader.samples, time.perf_counter() - started),
+        )
+
+        # The page as the endpoint builds it, then its serialization alone
+        async with app.state.sessionmaker() as session:
+            user = await load_user(
+                session, (await client.get("/auth/me", headers=headers)).json()["id"]
+            )
+            listing = await entriesController.listEntries(user, session, page)
+        rounds = 200
+        started = time.perf_counter()
+        for _ in range(rounds):
+            json_response(listing)
+        serialize = (time.perf_counter() - started) / rounds
+        share = serialize / (sum(pages.samples) / len(pages.samples))
+        print(
+            f"serialize one page of {page}: {serialize * 1000:.3f} ms"
+            f" ({share:.0%} of the request)"
+        )
+
+        async with app.state.sessionmaker() as session:
+            await session.execute(delete(Users).where(Users.username == username))
+            await session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--page", type=int, default=200)
+    parser.add_argument("--walks", type=int, default=3)
+    parser.add_argument("--reads", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.entries, args.page, args.walks, args.reads))
+
+
+if __name__ == "__main__":
+    main()
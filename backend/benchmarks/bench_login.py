@@ -0,0 +1,87 @@
+"""
+Login throughput and event-loop health under concurrent logins.
+
+    cd backend && DATABASE_URL=... python -m benchmarks.bench_login [--blocking]
+
+While CONCURRENCY clients log in back to back, a probe hits /health every few
+milliseconds. With bcrypt on the event loop the probe's p99 climbs to the
+cost of a hash; off the loop it stays flat. --blocking patches the old
+synchronous behaviour back in for comparison.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import delete
+
+from app import security
+from app.controllers import authController
+from app.models.user import Users
+
+from .common import Timer, app_client, report, summarize
+
+
+async def run(concurrency: int, duration: float, blocking: bool) -> None:
+    if blocking:
+
+        async def verify_inline(password: str, hashed: str) -> bool:
+            return security.verify_password(password, hashed)
+
+        authController.verify_password_async = verify_inline
+
+    username = f"bench-login-{uuid.uuid4().hex[:8]}"
+    password = "benchmark-password"
+
+    async with app_client() as client:
+        resp = await client.post(
+            "/auth/register", json={"username": username, "password": password}
+        )
+        resp.raise_for_status()
+
+        logins, probe = Timer(), Timer()
+        deadline = time.perf_counter() + duration
+
+        async def login_loop():
+            while time.perf_counter() < deadline:
+                async with logins.measure():
+                    resp = await client.post(
+                        "/auth/login",
+                        json={"username": username, "password": password},
+                    )
+                resp.raise_for_status()
+
+        async def probe_loop():
+            while time.perf_counter() < deadline:
+                async with probe.measure():
+                    await client.get("/health")
+                await asyncio.sleep(0.005)
+
+        started = time.perf_counter()
+        await asyncio.gather(probe_loop(), *(login_loop() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        from app.main import app
+
+        async with app.state.sessionmaker() as session:
+            await session.execute(delete(Users).where(Users.username == username))
+            await session.commit()
+
+    mode = "blocking" if blocking else "executor"
+    print(f"bcrypt rounds={security.BCRYPT_ROUNDS} mode={mode} concurrency={concurrency}")
+    report("POST /auth/login", summarize(logins.samples, elapsed))
+    report("GET /health (during logins)", summarize(probe.samples, elapsed))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--blocking", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args.concurrency, args.duration, args.blocking))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+AuthMiddleware overhead: pure ASGI vs a BaseHTTPMiddleware wrapper.
+
+    cd backend && python -m benchmarks.bench_middleware
+
+No database needed: the protected-path user comes from the user cache. The
+"basehttp" variant is a do-nothing BaseHTTPMiddleware, i.e. the per-request
+task and stream wrapping the old implementation paid before any auth work.
+"""
+
+import argparse
+import asyncio
+import time
+
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+from app.middlewares.auth import AuthMiddleware
+from app.security import create_access_token
+from app.userCache import CurrentUser, user_cache
+
+from .common import Timer, report, summarize
+
+USER_ID = 424242
+
+
+async def endpoint(scope, receive, send):
+    if scope["path"].endswith("/stream"):
+
+        async def body():
+            for _ in range(16):
+                yield b"\xff" * 4096
+
+        response = StreamingResponse(body(), media_type="audio/mpeg")
+    else:
+        response = PlainTextResponse("ok")
+    await response(scope, receive, send)
+
+
+class Passthrough(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+async def bench(app, path: str, headers: dict, requests: int, concurrency: int) -> dict:
+    timer = Timer()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        remaining = requests
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                async with timer.measure():
+                    resp = await client.get(path, headers=headers)
+                    resp.read()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return summarize(timer.samples, time.perf_counter() - started)
+
+
+async def run(requests: int, concurrency: int) -> None:
+    token = create_access_token(USER_ID, "bench")
+    user_cache.put(USER_ID, token, CurrentUser(USER_ID, "bench"))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    variants = {
+        "bare": endpoint,
+        "basehttp": Passthrough(endpoint),
+        "asgi": AuthMiddleware(endpoint, protected_paths=("/upload",)),
+    }
+    for path, hdrs in (
+        ("/open", {}),
+        ("/open/stream", {}),
+        ("/upload/x", headers),
+        ("/upload/stream", headers),
+    ):
+        for name, app in variants.items():
+            if name == "bare" and path.startswith("/upload"):
+                continue
+            report(f"{name:<9} {path}", await bench(app, path, hdrs, requests, concurrency))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
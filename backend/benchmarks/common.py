@@ -0,0 +1,58 @@
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+
+def percentile(samples: list[float], p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, math.ceil(p / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(samples: list[float], elapsed: float) -> dict:
+    """`samples` are per-request latencies in seconds."""
+    return {
+        "requests": len(samples),
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def report(name: str, summary: dict) -> None:
+    print(
+        f"{name:<32} {summary['requests']:>7} req  {summary['rps']:>9.1f} req/s  "
+        f"p50 {summary['p50_ms']:>8.2f} ms  p95 {summary['p95_ms']:>8.2f} ms  "
+        f"p99 {summary['p99_ms']:>8.2f} ms"
+    )
+
+
+@asynccontextmanager
+async def app_client() -> AsyncIterator[AsyncClient]:
+    """Same in-process setup as tests/conftest.py."""
+    from app.main import app
+
+    async with LifespanManager(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as ac:
+            yield ac
+
+
+class Timer:
+    def __init__(self):
+        self.samples: list[float] = []
+
+    @asynccontextmanager
+    async def measure(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples.append(time.perf_counter() - started)
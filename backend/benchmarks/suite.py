@@ -0,0 +1,347 @@
+"""
+Load test of every endpoint group, with a regression gate.
+
+    cd backend && DATABASE_URL=... python -m benchmarks.suite [--target uvicorn]
+    python -m benchmarks.suite --save-baseline        # record this machine
+    python -m benchmarks.suite                        # compare, exit 1 on regression
+
+--target inprocess (default) drives the app through LifespanManager +
+ASGITransport like the tests; --target uvicorn starts a real server and goes
+through sockets. Synthesis uses the local TTS engine, so numbers measure
+this service and not the upstream. Baselines are machine specific: record
+one per machine (and target, concurrency and --scale) and compare against it
+there; --save-baseline with --only updates just the scenarios it ran.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
+
+# Before the app is imported: offline synthesis with a small fixed latency
+os.environ.setdefault("TTS_ENGINE", "local")
+os.environ.setdefault("LOCAL_TTS_LATENCY", "0.02")
+os.environ.setdefault("DB_AUTO_MIGRATE", "1")
+os.environ.setdefault("ENTRY_PRERENDER", "0")
+# One user drives every synthesis scenario: measure the service, not its quotas
+for name in (
+    "SYNTHESIS_REQUESTS_PER_MINUTE",
+    "SYNTHESIS_CHARS_PER_MINUTE",
+    "SYNTHESIS_USER_CONCURRENCY",
+):
+    os.environ.setdefault(name, "0")
+
+from httpx import AsyncClient
+
+from .common import Timer, app_client, report, summarize
+
+BASELINE = Path(__file__).with_name("baseline.json")
+LIBRARY_SIZES = (10, 1000, 10000)
+VOICE = "en-US-AriaNeural"
+
+
+@dataclass
+class Scenario:
+    name: str
+    call: Callable[[AsyncClient, int], Awaitable[object]]
+    requests: int
+    # Run once before the warm-up, e.g. to create the entries it reads
+    setup: Callable[[AsyncClient], Awaitable[None]] | None = None
+
+
+@asynccontextmanager
+async def uvicorn_client() -> AsyncIterator[AsyncClient]:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "app.main:app",
+        "--port",
+        str(port),
+        cwd=Path(__file__).resolve().parent.parent,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    try:
+        # bcrypt logins queue behind a few hash workers: allow for that
+        async with AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", timeout=60
+        ) as client:
+            for _ in range(200):
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except Exception:
+                    pass
+                await asyncio.sleep(0.05)
+            else:
+                raise RuntimeError("uvicorn did not start")
+            yield client
+    finally:
+        server.terminate()
+        try:
+            await asyncio.wait_for(server.wait(), 10)
+        except TimeoutError:
+            server.kill()
+            await server.wait()
+
+
+async def register(client: AsyncClient, name: str) -> dict:
+    username = f"bench-{name}-{uuid.uuid4().hex[:8]}"
+    password = "benchmark-password"
+    body = {"username": username, "password": password}
+    (await client.post("/auth/register", json=body)).raise_for_status()
+    resp = await client.post("/auth/login", json=body)
+    resp.raise_for_status()
+    return {
+        "username": username,
+        "password": password,
+        "headers": {"Authorization": f"Bearer {resp.json()['token']}"},
+    }
+
+
+async def seed_library(client: AsyncClient, headers: dict, size: int) -> None:
+    lines = "".join(
+        json.dumps({"title": f"Entry {i}", "content": f"Benchmark entry {i}"}) + "\n"
+        for i in range(size)
+    )
+    resp = await client.post("/entries/bulk", headers=headers, content=lines)
+    resp.raise_for_status()
+
+
+def check(resp):
+    resp.raise_for_status()
+    return resp
+
+
+async def build(
+    client: AsyncClient, scale: float, concurrency: int
+) -> tuple[list[Scenario], list]:
+    """The scenarios and the users they created (deleted afterwards)."""
+    n = lambda count: max(1, int(count * scale))
+    users = []
+
+    auth = await register(client, "auth")
+    users.append(auth)
+    login = {"username": auth["username"], "password": auth["password"]}
+
+    crud = await register(client, "crud")
+    users.append(crud)
+    headers = crud["headers"]
+    ids = []
+
+    async def create(client, i):
+        resp = check(
+            await client.post(
+                "/entries/text",
+                headers=headers,
+                json={"title": f"T{i}", "content": f"Benchmark text number {i}"},
+            )
+        )
+        ids.append(resp.json()["id"])
+
+    async def read(client, i):
+        check(await client.get(f"/entries/{ids[i % len(ids)]}", headers=headers))
+
+    async def delete(client, i):
+        if ids:
+            check(await client.delete(f"/entries/{ids.pop()}", headers=headers))
+
+    async def fill(client, count):
+        # When --only skips POST /entries/text, nothing else creates them
+        while len(ids) < count:
+            await create(client, len(ids))
+
+    scenarios = [
+        Scenario(
+            "POST /auth/login",
+            lambda c, i: c.post("/auth/login", json=login),
+            n(200),
+        ),
+        Scenario("POST /entries/text", create, n(2000)),
+        Scenario("GET /entries/{id}", read, n(5000), lambda c: fill(c, 100)),
+        # The warm-up deletes too: one round of `concurrency` requests
+        Scenario(
+            "DELETE /entries/{id}",
+            delete,
+            n(1000),
+            lambda c: fill(c, n(1000) + concurrency),
+        ),
+    ]
+
+    for size in LIBRARY_SIZES:
+        owner = await register(client, f"lib{size}")
+        users.append(owner)
+        await seed_library(client, owner["headers"], size)
+        scenarios.append(
+            Scenario(
+                f"GET /entries/list/me ({size})",
+                lambda c, i, h=owner["headers"]: c.get(
+                    "/entries/list/me", headers=h, params={"limit": 50}
+                ),
+                n(2000),
+            )
+        )
+
+    synth = crud["headers"]
+    scenarios += [
+        Scenario(
+            "POST /synthesis/GET (miss)",
+            lambda c, i: c.post(
+                "/synthesis/GET",
+                headers=synth,
+                json={"text": f"Uncached sentence {uuid.uuid4().hex}", "voice": VOICE},
+            ),
+            n(500),
+        ),
+        Scenario(
+            "POST /synthesis/GET (hit)",
+            lambda c, i: c.post(
+                "/synthesis/GET",
+                headers=synth,
+                json={"text": "Cached sentence", "voice": VOICE},
+            ),
+            n(2000),
+        ),
+        Scenario(
+            "POST /synthesis/stream",
+            lambda c, i: c.post(
+                "/synthesis/stream",
+                headers=synth,
+                json={"text": "A streamed sentence. " * 20, "voice": VOICE},
+            ),
+            n(500),
+        ),
+    ]
+    return scenarios, users
+
+
+async def measure(client: AsyncClient, scenario: Scenario, concurrency: int) -> dict:
+    timer = Timer()
+    counter = iter(range(scenario.requests))
+
+    async def worker():
+        for i in counter:
+            async with timer.measure():
+                result = await scenario.call(client, i)
+            if hasattr(result, "raise_for_status"):
+                result.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(timer.samples, time.perf_counter() - started)
+
+
+async def cleanup(users: list) -> None:
+    from sqlalchemy import delete
+
+    from app.db import create_engine
+    from app.models.user import Users
+
+    engine = create_engine()
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(
+                delete(Users).where(Users.username.in_([u["username"] for u in users]))
+            )
+    finally:
+        await engine.dispose()
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if now["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {now['p95_ms']:.2f} ms vs {before['p95_ms']:.2f} ms"
+            )
+        if now["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {now['rps']:.1f} req/s vs {before['rps']:.1f} req/s"
+            )
+    return regressions
+
+
+async def run(args) -> int:
+    connect = uvicorn_client if args.target == "uvicorn" else app_client
+    results = {}
+    async with connect() as client:
+        scenarios, users = await build(client, args.scale, args.concurrency)
+        try:
+            for scenario in scenarios:
+                if args.only and args.only not in scenario.name:
+                    continue
+                if scenario.setup is not None:
+                    await scenario.setup(client)
+                # Warm up connections, caches and the pool first
+                await measure(
+                    client,
+                    Scenario(scenario.name, scenario.call, args.concurrency),
+                    args.concurrency,
+                )
+                results[scenario.name] = await measure(
+                    client, scenario, args.concurrency
+                )
+                report(scenario.name, results[scenario.name])
+        finally:
+            await cleanup(users)
+
+    # Request counts change latency under load: each scale is its own baseline
+    key = f"{args.target}/c{args.concurrency}/x{args.scale:g}"
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.save_baseline:
+        # Merged per scenario, so an --only run updates just what it measured
+        saved = stored.setdefault(key, {"results": {}})
+        saved["machine"] = (
+            f"{platform.node()} {platform.machine()} {os.cpu_count()} cpus"
+        )
+        saved["results"].update(results)
+        args.baseline.write_text(json.dumps(stored, indent=2) + "\n")
+        print(f"Baseline saved to {args.baseline} under {key}")
+        return 0
+    if key not in stored:
+        print(f"No baseline for {key}; record one with --save-baseline")
+        return 0
+
+    regressions = compare(results, stored[key]["results"], args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regression against {key} (tolerance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--target", choices=("inprocess", "uvicorn"), default="inprocess"
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scale", type=float, default=1.0, help="request count factor")
+    parser.add_argument("--only", help="run scenarios whose name contains this")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
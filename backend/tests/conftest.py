@@ -1,5 +1,14 @@
+import os
 import pytest
 
+# Synthesis tests run offline against the deterministic local engine
+os.environ.setdefault("TTS_ENGINE", "local")
+os.environ.setdefault("LOCAL_TTS_LATENCY", "0")
+# Minimum bcrypt cost keeps fixtures fast
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+# The test database is brought up to date on startup
+os.environ.setdefault("DB_AUTO_MIGRATE", "1")
+
 pytest_plugins = "db_fixtures"
 from httpx import AsyncClient, ASGITransport
 from asgi_lifespan import LifespanManager
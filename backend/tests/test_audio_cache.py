@@ -0,0 +1,195 @@
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.routing import Route
+
+
+from app.controllers import entriesController
+from app.tts.blobs import BlobInfo, BlobStore, LocalBlobStore, blob_response
+from app.tts.cache import AudioCache, cache_key, migrate_flat_layout
+from app.tts.store import EntryAudioStore, migrate_entry_dirs
+
+
+def test_cache_key_normalizes_text():
+    assert cache_key("Hello   world\n", "v", "+0%") == cache_key("Hello world", "v", "+0%")
+    assert cache_key("Hello", "v", "+0%") != cache_key("Hello", "v", "+10%")
+    assert cache_key("Hello", "v", "+0%") != cache_key("Hello", "w", "+0%")
+
+
+def test_cache_hit_and_miss(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    cache = AudioCache(store, max_bytes=1024)
+    key = cache_key("Testing", "voice", "+0%")
+
+    assert cache.get(key) is None
+    cache.put(key, b"\xff\xfbaudio")
+    assert cache.get(key).size == 7
+    assert store.read(key) == b"\xff\xfbaudio"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size_bytes"] == 7
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = AudioCache(LocalBlobStore(tmp_path), max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    assert cache.get("a") is not None
+
+    cache.put("c", b"12345")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_reloads_index_from_disk(tmp_path):
+    AudioCache(LocalBlobStore(tmp_path), max_bytes=100).put("a", b"12345")
+
+    cache = AudioCache(LocalBlobStore(tmp_path), max_bytes=100)
+    assert cache.stats()["size_bytes"] == 5
+    assert cache.get("a") is not None
+
+
+def test_blob_store_shards_and_groups(tmp_path):
+    store = LocalBlobStore(tmp_path)
+    store.write("a" * 64, b"cached")
+    store.open_group("7")
+    store.write_to_group("7/voice.mp3", b"entry")
+
+    # Two levels of shard directories above every group
+    path = store.local_path("7/voice.mp3")
+    assert path.relative_to(tmp_path).parts[2:] == ("7", "voice.mp3")
+    assert sorted(blob.key for blob in store.scan()) == ["7/voice.mp3", "a" * 64]
+
+    store.delete_group("7")
+    assert store.stat("7/voice.mp3") is None
+    # A group deleted while rendering is not recreated by a late write
+    with pytest.raises(FileNotFoundError):
+        store.write_to_group("7/voice.mp3", b"late")
+
+    with pytest.raises(ValueError):
+        store.local_path("7/../../etc")
+
+
+def test_old_layouts_are_moved_into_the_blob_store(tmp_path):
+    cache_root, entry_root = tmp_path / "cache", tmp_path / "entries"
+    key = cache_key("Old", "voice", "+0%")
+    cache_root.mkdir()
+    (cache_root / f"{key}.mp3").write_bytes(b"cached")
+    (cache_root / "stale.tmp").write_bytes(b"")
+
+    store = LocalBlobStore(cache_root)
+    assert migrate_flat_layout(cache_root, store) == 1
+    assert AudioCache(store, max_bytes=100).stats()["size_bytes"] == 6
+    assert store.read(key) == b"cached"
+    assert not list(cache_root.glob("*.*"))
+
+    entries = EntryAudioStore(LocalBlobStore(entry_root))
+    entries.prepare(7)
+    entries.put(7, "voice", "+0%", b"new")
+    # Entry 7's shard is root/79/02/, and 79 is also an old entry directory
+    path = entries.blobs.local_path("7/x")
+    assert path.relative_to(entry_root).parts[:2] == ("79", "02")
+    for name in ("3", "79"):
+        (entry_root / name).mkdir(exist_ok=True)
+        (entry_root / name / "old.mp3").write_bytes(name.encode())
+
+    assert migrate_entry_dirs(entry_root, entries.blobs) == 2
+    assert entries.blobs.read("3/old.mp3") == b"3"
+    assert entries.blobs.read("79/old.mp3") == b"79"
+    assert not (entry_root / "3").exists()
+    assert entries.blobs.read(entries.key_for(7, "voice", "+0%")) == b"new"
+    # Rerunning finds nothing left to move
+    assert migrate_entry_dirs(entry_root, entries.blobs) == 0
+
+
+class MemoryBlobStore(BlobStore):
+    """A remote store stand-in: no local files, blobs only through the API."""
+
+    def __init__(self):
+        self.blobs: dict[str, bytes] = {}
+
+    def stat(self, key):
+        data = self.blobs.get(key)
+        return None if data is None else BlobInfo(key, len(data), time.time())
+
+    def touch(self, key):
+        return self.stat(key)
+
+    def read(self, key):
+        return self.blobs.get(key)
+
+    def write(self, key, data):
+        self.blobs[key] = data
+
+    def delete(self, key):
+        self.blobs.pop(key, None)
+
+    def delete_group(self, group):
+        for key in [k for k in self.blobs if k.split("/")[0] == group]:
+            del self.blobs[key]
+
+    def list_group(self, group):
+        return [self.stat(k) for k in sorted(self.blobs) if k.split("/")[0] == group]
+
+    def scan(self):
+        return iter([self.stat(k) for k in self.blobs])
+
+
+class RedirectingBlobStore(MemoryBlobStore):
+    def url(self, key):
+        return f"https://blobs.example/{key}?signature=abc"
+
+
+@pytest.mark.asyncio
+async def test_remote_blobs_are_streamed_or_redirected(monkeypatch):
+    from app.tts.blobs import BlobStreamResponse
+
+    monkeypatch.setattr(BlobStreamResponse, "chunk_size", 4)
+    store = MemoryBlobStore()
+    store.write("7/voice.mp3", b"0123456789")
+    redirecting = RedirectingBlobStore()
+
+    async def serve(request):
+        target = redirecting if "redirect" in request.query_params else store
+        return blob_response(target, "7/voice.mp3", media_type="audio/mpeg")
+
+    app = Starlette(routes=[Route("/blob", serve)])
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.get("/blob")
+        assert resp.status_code == 200
+        assert resp.content == b"0123456789"
+        assert resp.headers["accept-ranges"] == "bytes"
+
+        resp = await ac.get("/blob", headers={"Range": "bytes=2-6"})
+        assert resp.status_code == 206
+        assert resp.content == b"23456"
+        assert resp.headers["content-range"] == "bytes 2-6/10"
+
+        resp = await ac.get("/blob", headers={"Range": "bytes=-3"})
+        assert resp.content == b"789"
+
+        resp = await ac.get("/blob", headers={"Range": "bytes=10-"})
+        assert resp.status_code == 416
+        assert resp.headers["content-range"] == "bytes */10"
+
+        resp = await ac.get("/blob", params={"redirect": 1})
+        assert resp.status_code == 307
+        assert resp.headers["location"].startswith("https://blobs.example/7/voice.mp3")
+
+    with pytest.raises(FileNotFoundError):
+        blob_response(store, "7/missing.mp3", media_type="audio/mpeg")
+
+    # The export reads remote audio a range at a time too
+    monkeypatch.setattr(entriesController, "EXPORT_AUDIO_READ", 3)
+    entries = EntryAudioStore(store)
+    chunks = [c async for c in entriesController.readBlob(entries, "7/voice.mp3")]
+    assert chunks == [b"012", b"345", b"678", b"9"]
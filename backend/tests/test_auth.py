@@ -1,4 +1,9 @@
 import os, pytest
+import bcrypt
+from sqlalchemy import select
+
+from app import security
+from app.models.user import Users
 
 
 @pytest.mark.asyncio
@@ -48,3 +53,33 @@ async def test_login_wrong_password(client, user_cleanup):
         "/auth/login", json={"username": username, "password": password}
     )
     assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_when_cost_changes(
+    client, db_session, user_cleanup, monkeypatch
+):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping auth test")
+
+    username = "rehash-user"
+    user_cleanup(username)
+    password = "password"
+    old_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt(4)).decode()
+    db_session.add(Users(username=username, hashed_password=old_hash))
+    await db_session.commit()
+
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 5)
+    resp = await client.post(
+        "/auth/login", json={"username": username, "password": password}
+    )
+    assert resp.status_code == 200
+
+    db_session.expire_all()
+    stored = (
+        await db_session.execute(
+            select(Users.hashed_password).where(Users.username == username)
+        )
+    ).scalar_one()
+    assert stored.startswith("$2b$05$")
+    assert bcrypt.checkpw(password.encode(), stored.encode())
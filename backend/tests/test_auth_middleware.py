@@ -1,7 +1,13 @@
 import os, pytest
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy import delete
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+
+from app.middlewares.auth import AuthMiddleware
 from app.models.user import Users
 from app.security import create_access_token
+from app.userCache import CurrentUser, user_cache
 
 
 @pytest.mark.asyncio
@@ -91,3 +97,37 @@ async def test_protected_route_allows_valid_user(client, db_session, user_cleanu
     )
 
     assert resp.status_code != 401
+
+
+@pytest.mark.asyncio
+async def test_middleware_passes_streams_and_shares_user():
+    async def endpoint(scope, receive, send):
+        request = Request(scope, receive)
+        if scope["path"] == "/stream":
+
+            async def body():
+                for i in range(3):
+                    yield f"chunk-{i};".encode()
+
+            response = StreamingResponse(body(), media_type="text/plain")
+        else:
+            user = getattr(request.state, "user", None)
+            response = JSONResponse({"user": user.username if user else None})
+        await response(scope, receive, send)
+
+    token = create_access_token(987654, "state-user")
+    user_cache.put(987654, token, CurrentUser(987654, "state-user"))
+    app = AuthMiddleware(endpoint, protected_paths=("/upload",))
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        resp = await ac.get("/stream")
+        assert resp.text == "chunk-0;chunk-1;chunk-2;"
+
+        resp = await ac.get("/upload/x", headers={"Authorization": f"Bearer {token}"})
+        assert resp.json() == {"user": "state-user"}
+
+        resp = await ac.get("/upload/x")
+        assert resp.status_code == 401
+
+    user_cache.invalidate(987654)
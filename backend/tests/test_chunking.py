@@ -0,0 +1,51 @@
+import asyncio
+import pytest
+
+from app.controllers import TTSController
+from app.tts.chunking import split_text
+
+
+def test_split_text_short_text_is_one_chunk():
+    assert split_text("Hello there. How are you?", 100) == [
+        "Hello there. How are you?"
+    ]
+
+
+def test_split_text_respects_sentence_boundaries():
+    text = "First sentence here. Second one is here! Third? Fourth sentence."
+    chunks = split_text(text, 30)
+
+    assert all(len(chunk) <= 30 for chunk in chunks)
+    assert " ".join(chunks) == text
+    assert all(chunk[-1] in ".!?" for chunk in chunks)
+
+
+def test_split_text_breaks_run_on_sentences_at_words():
+    chunks = split_text("word " * 50, 20)
+
+    assert all(len(chunk) <= 20 for chunk in chunks)
+    assert " ".join(chunks).split() == ["word"] * 50
+
+
+@pytest.mark.asyncio
+async def test_stream_renders_chunks_concurrently_in_order(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def fake_engine(text, voice, rate):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later chunks finish first; output order must not change
+        await asyncio.sleep(0.05 if text.startswith("A") else 0.01)
+        in_flight -= 1
+        yield text.encode()
+
+    monkeypatch.setattr(TTSController, "engine_stream", fake_engine)
+    monkeypatch.setattr(TTSController, "SYNTHESIS_CHUNK_CHARS", 12)
+    monkeypatch.setattr(TTSController, "SYNTHESIS_CONCURRENCY", 2)
+
+    audio = await TTSController.render("Alpha one. Beta two. Gamma three.", "v", "+0%")
+
+    assert audio == b"Alpha one.Beta two.Gamma three."
+    assert peak == 2
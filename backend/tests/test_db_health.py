@@ -12,3 +12,59 @@ async def test_db_health(client):
     data = r.json()
     assert data["db"] == "ok"
     assert data["result"] == 1
+
+
+@pytest.mark.asyncio
+async def test_db_pool_stats(client):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping DB pool test")
+
+    from app import db
+
+    r = await client.get("/db/pool")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["size"] == db.DB_POOL_SIZE
+    assert data["max_overflow"] == db.DB_MAX_OVERFLOW
+    assert 0 <= data["saturation"] <= 1
+
+
+@pytest.mark.asyncio
+async def test_session_checks_out_lazily(client):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping DB pool test")
+
+    from sqlalchemy import text
+
+    from app.main import app
+    from app.metrics import db_checkout_wait
+
+    pool = app.state.engine.pool
+    before = db_checkout_wait.count()
+    async with app.state.sessionmaker() as session:
+        assert pool.checkedout() == 0
+        await session.execute(text("select 1"))
+        assert pool.checkedout() == 1
+        # Same transaction, same connection: no second checkout
+        await session.execute(text("select 1"))
+        assert db_checkout_wait.count() == before + 1
+        await session.commit()
+        await session.execute(text("select 1"))
+        assert db_checkout_wait.count() == before + 2
+
+
+@pytest.mark.asyncio
+async def test_db_pool_stats_sqlite(tmp_path, monkeypatch):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app import db
+
+    # SQLite engines never get the DB_* pool settings: report the pool's own
+    monkeypatch.setattr(db, "DB_MAX_OVERFLOW", 3)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/pool.db")
+    try:
+        stats = db.pool_stats(engine)
+    finally:
+        await engine.dispose()
+    assert stats["max_overflow"] == 10
+    assert stats["saturation"] == 0
@@ -1,5 +1,7 @@
 import os, pytest
 
+from app.schemas.entriesSchemas import EntryOut
+
 
 @pytest.mark.asyncio
 async def test_entries(client, entry_cleanup, auth_header):
@@ -30,7 +32,10 @@ async def test_entries(client, entry_cleanup, auth_header):
     )
 
     assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
     getData = resp.json()
+    # Exactly the response model: no relationships, no internal columns
+    assert set(getData) == set(EntryOut.model_fields)
 
     getTitle = getData["title"]
     getContent = getData["content"]
@@ -78,6 +83,7 @@ async def test_entries(client, entry_cleanup, auth_header):
     entries = payload["entries"]
     assert len(entries) == 2
     assert entries[0]["date"] is not None
+    assert set(entries[0]) == {"id", "title", "date"}
 
     # Delete entry test
     resp = await client.delete(f"/entries/{entryId}", headers=headers)
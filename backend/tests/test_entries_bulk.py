@@ -0,0 +1,63 @@
+import json
+import os, pytest
+from sqlalchemy import delete
+
+from app.controllers import entriesController
+from app.models.entry import Entries
+
+
+@pytest.mark.asyncio
+async def test_bulk_upload_ndjson(client, db_session, auth_header):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping entries tests")
+
+    headers, user = auth_header
+    lines = [
+        json.dumps({"title": "One", "content": "First imported entry"}),
+        "",
+        "{not json",
+        json.dumps({"title": "", "content": "Second imported entry"}),
+        json.dumps({"title": "Short", "content": "no"}),
+        json.dumps({"title": "Three", "content": "Third imported entry"}),
+    ]
+
+    async def body():
+        # Split mid-line to exercise incremental parsing
+        data = ("\n".join(lines) + "\n").encode()
+        for i in range(0, len(data), 7):
+            yield data[i : i + 7]
+
+    try:
+        resp = await client.post(
+            "/entries/bulk",
+            headers={**headers, "Content-Type": "application/x-ndjson"},
+            content=body(),
+        )
+        assert resp.status_code == 200
+        result = resp.json()
+        assert result["inserted"] == 3
+        assert result["failed"] == 2
+        assert [error["line"] for error in result["errors"]] == [3, 5]
+        assert result["errors"][1]["error"].startswith("content:")
+
+        resp = await client.get("/entries/list/me", headers=headers)
+        titles = [entry["title"] for entry in resp.json()["entries"]]
+        assert titles == ["One", "Second imported entry", "Three"]
+    finally:
+        await db_session.execute(delete(Entries).where(Entries.user_id == user.id))
+        await db_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_caps_every_line(monkeypatch):
+    monkeypatch.setattr(entriesController, "BULK_MAX_LINE_BYTES", 10)
+
+    async def chunks():
+        # Fits, spans two chunks past the cap, sits whole inside one chunk
+        # past the cap, fits, and runs past the cap in an unfinished tail
+        yield b"short\n" + b"x" * 8
+        yield b"yyyy\n" + b"z" * 20 + b"\nok\n"
+        yield b"w" * 11
+
+    lines = [line async for line in entriesController.iterLines(chunks())]
+    assert lines == [b"short", None, None, b"ok", None]
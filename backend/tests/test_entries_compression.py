@@ -0,0 +1,83 @@
+import os, pytest
+from sqlalchemy import select
+
+from app import compression
+from app.main import app
+from app.models.entry import Entries
+
+
+@pytest.mark.asyncio
+async def test_compressed_entry_reads_back(
+    client, db_session, entry_cleanup, auth_header, monkeypatch
+):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping compression tests")
+
+    monkeypatch.setattr(compression, "ENTRY_COMPRESSION", "zlib")
+    monkeypatch.setattr(compression, "ENTRY_COMPRESSION_MIN_CHARS", 100)
+    headers, user = auth_header
+    content = "The whale surfaced near the ship. " * 50
+
+    resp = await client.post(
+        "/entries/text", headers=headers, json={"title": "Moby", "content": content}
+    )
+    assert resp.status_code == 201
+    entry_id = resp.json()["id"]
+    entry_cleanup(entry_id)
+
+    row = (
+        await db_session.execute(
+            select(Entries.content, Entries.content_z, Entries.compression).where(
+                Entries.id == entry_id
+            )
+        )
+    ).one()
+    assert row.compression == "zlib"
+    assert row.content == ""
+    assert len(row.content_z) < len(content)
+
+    resp = await client.get(f"/entries/{entry_id}", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["content"] == content
+
+    resp = await client.get(f"/entries/{entry_id}/content", headers=headers)
+    assert resp.text == content
+
+    # Search still matches and highlights compressed rows
+    resp = await client.get("/entries/search", headers=headers, params={"q": "whale"})
+    [hit] = resp.json()["results"]
+    assert hit["id"] == entry_id
+    assert "<b>whale</b>" in hit["snippet"]
+
+
+@pytest.mark.asyncio
+async def test_backfill_compresses_plain_rows(
+    client, db_session, entry_cleanup, auth_header, monkeypatch
+):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping compression tests")
+
+    headers, user = auth_header
+    short = "short entry"
+    long = "Call me Ishmael. " * 40
+    ids = []
+    for content in (short, long):
+        resp = await client.post(
+            "/entries/text", headers=headers, json={"title": "Old", "content": content}
+        )
+        ids.append(resp.json()["id"])
+        entry_cleanup(ids[-1])
+
+    monkeypatch.setattr(compression, "ENTRY_COMPRESSION", "zlib")
+    monkeypatch.setattr(compression, "ENTRY_COMPRESSION_MIN_CHARS", 100)
+    assert await compression.compressBacklog(app.state.sessionmaker) >= 1
+
+    rows = (
+        await db_session.execute(
+            select(Entries.id, Entries.compression).where(Entries.id.in_(ids))
+        )
+    ).all()
+    assert dict(rows) == {ids[0]: None, ids[1]: "zlib"}
+
+    resp = await client.get(f"/entries/{ids[1]}", headers=headers)
+    assert resp.json()["content"] == long
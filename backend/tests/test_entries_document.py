@@ -0,0 +1,134 @@
+import os, pytest
+
+from app.controllers import entriesController
+
+
+@pytest.mark.asyncio
+async def test_document_upload_and_ranges(
+    client, entry_cleanup, auth_header, monkeypatch
+):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping document tests")
+
+    monkeypatch.setattr(entriesController, "DOCUMENT_CHUNK_CHARS", 1000)
+    headers, user = auth_header
+    # Multi-byte characters straddle the request chunk boundaries
+    document = "".join(f"Line {i} – ünïcödé text.\n" for i in range(2000))
+
+    async def body():
+        data = document.encode()
+        for i in range(0, len(data), 4093):
+            yield data[i : i + 4093]
+
+    resp = await client.post(
+        "/entries/document",
+        headers={**headers, "Content-Type": "text/plain; charset=utf-8"},
+        params={"title": "Big book"},
+        content=body(),
+    )
+    assert resp.status_code == 201
+    created = resp.json()
+    entry_cleanup(created["id"])
+    assert created["length"] == len(document)
+    assert created["chunks"] == -(-len(document) // 1000)
+
+    resp = await client.get(f"/entries/{created['id']}/content", headers=headers)
+    assert resp.status_code == 200
+    assert resp.text == document
+
+    resp = await client.get(
+        f"/entries/{created['id']}/content",
+        headers=headers,
+        params={"start": 1500, "end": 4200},
+    )
+    assert resp.text == document[1500:4200]
+
+    # Listing never carries content
+    resp = await client.get("/entries/list/me", headers=headers)
+    assert [e["title"] for e in resp.json()["entries"]] == ["Big book"]
+
+
+@pytest.mark.asyncio
+async def test_document_multipart_upload(client, entry_cleanup, auth_header):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping document tests")
+
+    headers, user = auth_header
+    resp = await client.post(
+        "/entries/document",
+        headers=headers,
+        params={"title": "Uploaded"},
+        files={"file": ("book.txt", "Once upon a time.".encode(), "text/plain")},
+    )
+    assert resp.status_code == 201
+    entry_id = resp.json()["id"]
+    entry_cleanup(entry_id)
+
+    resp = await client.get(
+        f"/entries/{entry_id}/content", headers=headers, params={"start": 5}
+    )
+    assert resp.text == "upon a time."
+
+    resp = await client.post(
+        "/entries/document",
+        headers={**headers, "Content-Type": "text/plain"},
+        params={"title": "Broken"},
+        content=b"\xff\xfe invalid",
+    )
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_document_size_cap(client, auth_header, monkeypatch):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping document tests")
+
+    monkeypatch.setattr(entriesController, "DOCUMENT_MAX_BYTES", 100 * 1024)
+    headers, user = auth_header
+
+    # Refused on Content-Length alone
+    resp = await client.post(
+        "/entries/document",
+        headers={**headers, "Content-Type": "text/plain"},
+        params={"title": "Too big"},
+        content=b"x" * (100 * 1024 + 1),
+    )
+    assert resp.status_code == 413
+
+    # No length declared: the multipart body is cut off while it is parsed,
+    # long before the client is done sending it
+    boundary = "vocodex-test-boundary"
+    sent = 0
+
+    async def body():
+        nonlocal sent
+        yield (
+            f"--{boundary}\r\n"
+            'Content-Disposition: form-data; name="file"; filename="big.txt"\r\n'
+            "Content-Type: text/plain\r\n\r\n"
+        ).encode()
+        for _ in range(1000):
+            sent += 1
+            yield b"x" * 1024
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    resp = await client.post(
+        "/entries/document",
+        headers={
+            **headers,
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        },
+        params={"title": "Too big"},
+        content=body(),
+    )
+    assert resp.status_code == 413
+    assert sent < 1000
+
+    resp = await client.post(
+        "/entries/document",
+        headers=headers,
+        params={"title": "No file"},
+        files={"other": ("book.txt", b"Once upon a time.", "text/plain")},
+    )
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Missing file field"
@@ -0,0 +1,77 @@
+import os, pytest
+
+
+@pytest.mark.asyncio
+async def test_entry_etag_revalidation(client, entry_cleanup, auth_header):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping etag tests")
+
+    headers, user = auth_header
+    resp = await client.post(
+        "/entries/text", headers=headers, json={"title": "T", "content": "Some text"}
+    )
+    entry_id = resp.json()["id"]
+    entry_cleanup(entry_id)
+
+    resp = await client.get(f"/entries/{entry_id}", headers=headers)
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+
+    resp = await client.get(
+        f"/entries/{entry_id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    assert resp.content == b""
+
+    resp = await client.get(
+        f"/entries/{entry_id}", headers={**headers, "If-None-Match": '"stale"'}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["content"] == "Some text"
+
+    resp = await client.get(
+        "/entries/999999999", headers={**headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_listing_etag_changes_with_library(client, entry_cleanup, auth_header):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping etag tests")
+
+    headers, user = auth_header
+    resp = await client.get("/entries/list/me", headers=headers)
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+
+    resp = await client.get(
+        "/entries/list/me", headers={**headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+
+    # Other pages of the same library have their own validators
+    resp = await client.get("/entries/list/me?limit=1", headers=headers)
+    assert resp.headers["etag"] != etag
+
+    resp = await client.post(
+        "/entries/text", headers=headers, json={"title": "T", "content": "New one"}
+    )
+    entry_id = resp.json()["id"]
+    entry_cleanup(entry_id)
+
+    resp = await client.get(
+        "/entries/list/me", headers={**headers, "If-None-Match": etag}
+    )
+    assert resp.status_code == 200
+    added = resp.headers["etag"]
+    assert added != etag
+
+    resp = await client.delete(f"/entries/{entry_id}", headers=headers)
+    assert resp.status_code == 204
+    resp = await client.get(
+        "/entries/list/me", headers={**headers, "If-None-Match": added}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["entries"] == []
@@ -0,0 +1,98 @@
+import io, json, os, pytest, zipfile
+
+from app.controllers import entriesController
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_and_zip(client, entry_cleanup, auth_header, monkeypatch):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping export tests")
+
+    # Several cursor fetches and several chunks per document
+    monkeypatch.setattr(entriesController, "EXPORT_FETCH_SIZE", 2)
+    monkeypatch.setattr(entriesController, "DOCUMENT_CHUNK_CHARS", 100)
+    headers, user = auth_header
+
+    texts = [f'Entry "{i}" – ünïcödé\n' for i in range(5)]
+    ids = []
+    for i, text in enumerate(texts):
+        resp = await client.post(
+            "/entries/text", headers=headers, json={"title": f"T{i}", "content": text}
+        )
+        ids.append(resp.json()["id"])
+        entry_cleanup(ids[-1])
+
+    document = "".join(f"Line {i} of the book.\n" for i in range(100))
+    resp = await client.post(
+        "/entries/document",
+        headers={**headers, "Content-Type": "text/plain; charset=utf-8"},
+        params={"title": "Book"},
+        content=document.encode(),
+    )
+    ids.append(resp.json()["id"])
+    entry_cleanup(ids[-1])
+    texts.append(document)
+
+    resp = await client.get("/entries/export", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [line["id"] for line in lines] == ids
+    assert [line["content"] for line in lines] == texts
+
+    store = app.state.entry_audio
+    store.prepare(ids[0])
+    store.put(ids[0], "en-US-AriaNeural", "+0%", b"\xff\xf3audio")
+
+    resp = await client.get(
+        "/entries/export", headers=headers, params={"format": "zip"}
+    )
+    assert resp.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(resp.content))
+    exported = [
+        json.loads(line) for line in archive.read("entries.ndjson").splitlines()
+    ]
+    assert [line["content"] for line in exported] == texts
+    key = store.key_for(ids[0], "en-US-AriaNeural", "+0%")
+    assert archive.read(f"audio/{key}") == b"\xff\xf3audio"
+
+    resp = await client.get("/entries/export")
+    assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_export_holds_one_connection(
+    client, entry_cleanup, auth_header, monkeypatch
+):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping export tests")
+
+    from app.userCache import user_cache
+
+    headers, user = auth_header
+    for i in range(3):
+        resp = await client.post(
+            "/entries/text",
+            headers=headers,
+            json={"title": f"T{i}", "content": f"Entry {i}"},
+        )
+        entry_cleanup(resp.json()["id"])
+
+    pool = app.state.engine.pool
+    held = []
+    export = entriesController.exportEntries
+
+    async def watched(*args):
+        async for chunk in export(*args):
+            held.append(pool.checkedout())
+            yield chunk
+
+    monkeypatch.setattr(entriesController, "exportEntries", watched)
+    # A cache miss looks the user up; that connection must be back by now
+    user_cache.clear()
+    # The fixtures' own session may hold one
+    idle = pool.checkedout()
+    resp = await client.get("/entries/export", headers=headers)
+    assert resp.status_code == 200
+    assert held and max(held) == idle + 1
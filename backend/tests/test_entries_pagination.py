@@ -0,0 +1,44 @@
+import os, pytest
+
+
+@pytest.mark.asyncio
+async def test_list_entries_pages_with_cursor(client, entry_cleanup, auth_header):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping entries tests")
+
+    headers, user = auth_header
+    created = []
+    for i in range(5):
+        resp = await client.post(
+            "/entries/text",
+            headers=headers,
+            json={"title": f"Page {i}", "content": f"Content number {i}"},
+        )
+        assert resp.status_code == 201
+        created.append(resp.json()["id"])
+        entry_cleanup(created[-1])
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await client.get("/entries/list/me", headers=headers, params=params)
+        assert resp.status_code == 200
+        payload = resp.json()
+        assert len(payload["entries"]) <= 2
+        seen += [entry["id"] for entry in payload["entries"]]
+        pages += 1
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == created
+    assert pages == 3
+
+    resp = await client.get(
+        "/entries/list/me", headers=headers, params={"cursor": "not-a-cursor"}
+    )
+    assert resp.status_code == 400
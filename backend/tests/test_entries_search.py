@@ -0,0 +1,80 @@
+import json
+import os, pytest
+
+from app.controllers import entriesController
+
+
+@pytest.mark.asyncio
+async def test_search_entries(client, entry_cleanup, auth_header):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping search tests")
+    if not os.environ["DATABASE_URL"].startswith("postgresql"):
+        pytest.skip("Full-text search needs PostgreSQL")
+
+    headers, user = auth_header
+    docs = [
+        ("Whales", "The blue whale is the largest animal that ever lived."),
+        ("Ocean life", "Whales and dolphins are mammals. A whale breathes air."),
+        ("Cooking", "Boil the pasta for ten minutes, then add the sauce."),
+    ]
+    for title, content in docs[:2]:
+        resp = await client.post(
+            "/entries/text", headers=headers, json={"title": title, "content": content}
+        )
+        assert resp.status_code == 201
+        entry_cleanup(resp.json()["id"])
+
+    # The bulk path keeps the search document in sync too
+    resp = await client.post(
+        "/entries/bulk",
+        headers=headers,
+        content=json.dumps({"title": docs[2][0], "content": docs[2][1]}),
+    )
+    assert resp.json()["inserted"] == 1
+
+    # A title hit outranks a content hit
+    resp = await client.get("/entries/search", headers=headers, params={"q": "whales"})
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["title"] for r in results] == ["Whales", "Ocean life"]
+    assert "<b>Whales</b>" in results[1]["snippet"]
+
+    resp = await client.get("/entries/search", headers=headers, params={"q": "pasta"})
+    results = resp.json()["results"]
+    assert [r["title"] for r in results] == ["Cooking"]
+    entry_cleanup(results[0]["id"])
+
+    resp = await client.get(
+        "/entries/search", headers=headers, params={"q": "whales", "limit": 1}
+    )
+    payload = resp.json()
+    assert len(payload["results"]) == 1
+    assert payload["next_offset"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_uploaded_document(
+    client, entry_cleanup, auth_header, monkeypatch
+):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping search tests")
+    if not os.environ["DATABASE_URL"].startswith("postgresql"):
+        pytest.skip("Full-text search needs PostgreSQL")
+
+    monkeypatch.setattr(entriesController, "DOCUMENT_CHUNK_CHARS", 100)
+    headers, user = auth_header
+    # 16 chunks of 100 characters per batch: "lighthouse" straddles the first
+    # batch boundary and "narwhal" only arrives in the last one
+    document = "sea " * 398 + "lighthouse " + "tide " * 1000 + "narwhal"
+    resp = await client.post(
+        "/entries/document",
+        headers={**headers, "Content-Type": "text/plain; charset=utf-8"},
+        params={"title": "Logbook"},
+        content=document.encode(),
+    )
+    assert resp.status_code == 201
+    entry_cleanup(resp.json()["id"])
+
+    for word in ("logbook", "lighthouse", "narwhal"):
+        resp = await client.get("/entries/search", headers=headers, params={"q": word})
+        assert [r["title"] for r in resp.json()["results"]] == ["Logbook"]
@@ -0,0 +1,56 @@
+import os, pytest
+
+from app.controllers import TTSController
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_entry_audio(client, entry_cleanup, auth_header, monkeypatch):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping entry audio tests")
+
+    renders = []
+
+    async def fake_render(text, voice, rate):
+        renders.append((text, voice, rate))
+        return b"\xff\xfb" + text.encode()
+
+    monkeypatch.setattr(TTSController, "render", fake_render)
+    headers, user = auth_header
+
+    # Upload pre-renders the default voice in the background
+    resp = await client.post(
+        "/entries/text",
+        headers=headers,
+        json={"title": "Audio", "content": "Read me out loud"},
+    )
+    assert resp.status_code == 201
+    entryId = resp.json()["id"]
+    entry_cleanup(entryId)
+    assert len(renders) == 1
+
+    resp = await client.get(f"/entries/{entryId}/audio", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "audio/mpeg"
+    assert resp.content == b"\xff\xfbRead me out loud"
+    assert len(renders) == 1
+
+    # Another voice is rendered on demand, once
+    for _ in range(2):
+        resp = await client.get(
+            f"/entries/{entryId}/audio",
+            headers=headers,
+            params={"voice": "ar-EG-SalmaNeural"},
+        )
+        assert resp.status_code == 200
+    assert len(renders) == 2
+
+    # Deleting the entry drops its audio
+    store = app.state.entry_audio
+    assert store.get(entryId, TTSController.DEFAULT_VOICE, "+0%") is not None
+    resp = await client.delete(f"/entries/{entryId}", headers=headers)
+    assert resp.status_code == 204
+    assert store.get(entryId, TTSController.DEFAULT_VOICE, "+0%") is None
+
+    resp = await client.get(f"/entries/{entryId}/audio", headers=headers)
+    assert resp.status_code == 404
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import pytest
+
+from app.controllers import TTSController
+from app.jobs import pool as jobs_pool
+from app.jobs.pool import WorkerPool
+from app.jobs.queue import (
+    DONE,
+    QUEUED,
+    RUNNING,
+    MemoryJobQueue,
+    QueueFull,
+    SqliteJobQueue,
+)
+from app.main import app
+from app.models.user import Users
+from app.security import create_access_token
+from app.tts.blobs import LocalBlobStore
+from app.tts.cache import AudioCache
+
+
+@pytest.mark.asyncio
+async def test_memory_queue_rejects_when_full():
+    queue = MemoryJobQueue(max_depth=1, retain_seconds=60)
+    await queue.submit("one", "voice", "+0%", 1)
+
+    with pytest.raises(QueueFull):
+        await queue.submit("two", "voice", "+0%", 1)
+
+    job = await queue.next()
+    assert job.status == RUNNING
+    await queue.submit("two", "voice", "+0%", 1)
+
+
+@pytest.mark.asyncio
+async def test_sqlite_queue_is_shared_between_instances(tmp_path):
+    path = tmp_path / "jobs.sqlite3"
+    producer = SqliteJobQueue(path, 2, 60, 600, 0.01)
+    consumer = SqliteJobQueue(path, 2, 60, 600, 0.01)
+
+    job = await producer.submit("hello", "voice", "+0%", 1)
+    assert (await producer.get(job.id)).status == QUEUED
+    await producer.submit("again", "voice", "+0%", 1)
+    with pytest.raises(QueueFull):
+        await producer.submit("full", "voice", "+0%", 1)
+
+    claimed = await consumer.next()
+    assert (claimed.id, claimed.user_id) == (job.id, 1)
+    await consumer.complete(claimed.id, "key")
+
+    done = await producer.get(job.id)
+    assert done.status == DONE
+    assert done.result_key == "key"
+    assert await producer.depth() == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_queue_errors(tmp_path, monkeypatch):
+    class FlakyQueue(MemoryJobQueue):
+        failures = {"next": 1, "complete": 1}
+
+        def _flake(self, method):
+            if self.failures[method]:
+                self.failures[method] -= 1
+                raise OSError(f"{method} unavailable")
+
+        async def next(self):
+            self._flake("next")
+            return await super().next()
+
+        async def complete(self, job_id, result_key):
+            self._flake("complete")
+            await super().complete(job_id, result_key)
+
+    async def fake_render(text, voice, rate):
+        return b"\xff\xfb" + text.encode()
+
+    monkeypatch.setattr(TTSController, "render", fake_render)
+    monkeypatch.setattr(jobs_pool, "JOBS_ERROR_BACKOFF", 0)
+    queue = FlakyQueue(max_depth=10, retain_seconds=60)
+    pool = WorkerPool(queue, AudioCache(LocalBlobStore(tmp_path), 1024), 1)
+    lost = await queue.submit("lost", "voice", "+0%", 1)
+    kept = await queue.submit("kept", "voice", "+0%", 1)
+    pool.start()
+    try:
+        for _ in range(100):
+            if (await queue.get(kept.id)).status == DONE:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await pool.stop()
+
+    # Only the job body marks a job failed: the one whose completion could
+    # not be recorded stays running until the queue hands it out again
+    assert (await queue.get(kept.id)).status == DONE
+    assert (await queue.get(lost.id)).status == RUNNING
+
+
+@pytest.mark.asyncio
+async def test_synthesis_job_roundtrip(
+    client, db_session, user_cleanup, auth_header, monkeypatch
+):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping synthesis tests")
+
+    headers, user = auth_header
+
+    async def fake_render(text, voice, rate):
+        return b"\xff\xfb" + text.encode()
+
+    monkeypatch.setattr(TTSController, "render", fake_render)
+
+    resp = await client.post(
+        "/synthesis/jobs",
+        headers=headers,
+        json={"text": "Queued job text", "voice": "ar-EG-SalmaNeural"},
+    )
+    assert resp.status_code == 202
+    job_id = resp.json()["id"]
+
+    for _ in range(100):
+        resp = await client.get(f"/synthesis/jobs/{job_id}", headers=headers)
+        assert resp.status_code == 200
+        if resp.json()["status"] == DONE:
+            break
+        await asyncio.sleep(0.01)
+    assert resp.json()["status"] == DONE
+
+    resp = await client.get(f"/synthesis/jobs/{job_id}/result", headers=headers)
+    assert resp.status_code == 200
+    assert resp.content == b"\xff\xfbQueued job text"
+
+    resp = await client.get("/synthesis/jobs/unknown", headers=headers)
+    assert resp.status_code == 404
+
+    # Other users cannot see the job or its result
+    user_cleanup("jobs-other-user")
+    other = Users(username="jobs-other-user", hashed_password="irrelevant")
+    db_session.add(other)
+    await db_session.commit()
+    await db_session.refresh(other)
+    other_headers = {
+        "Authorization": f"Bearer {create_access_token(other.id, other.username)}"
+    }
+    for path in (f"/synthesis/jobs/{job_id}", f"/synthesis/jobs/{job_id}/result"):
+        resp = await client.get(path, headers=other_headers)
+        assert resp.status_code == 404
+    resp = await client.get(f"/synthesis/jobs/{job_id}")
+    assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_synthesis_job_queue_full(client, auth_header, monkeypatch):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping synthesis tests")
+
+    headers, user = auth_header
+    # No worker consumes this queue, so it stays full after one job
+    queue = MemoryJobQueue(1, 60)
+    await queue.submit("t", "v", "+0%", 1)
+    monkeypatch.setattr(app.state, "job_queue", queue)
+
+    resp = await client.post(
+        "/synthesis/jobs",
+        headers=headers,
+        json={"text": "t", "voice": "ar-EG-SalmaNeural"},
+    )
+    assert resp.status_code == 429
+    assert "retry-after" in resp.headers
@@ -0,0 +1,44 @@
+import os, pytest
+
+from app.metrics import Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    latency = registry.histogram("req_seconds", "Latency", ("route",), (0.1, 1))
+    latency.observe(0.05, "/a")
+    latency.observe(0.1, "/a")
+    latency.observe(3, "/a")
+
+    text = registry.render()
+    assert "# TYPE req_seconds histogram" in text
+    assert 'req_seconds_bucket{route="/a",le="0.1"} 2' in text
+    assert 'req_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'req_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'req_seconds_count{route="/a"} 3' in text
+
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    registry.counter("hits_total", "Hits", ("path",)).inc('a"b\\c')
+    assert 'hits_total{path="a\\"b\\\\c"} 1' in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client):
+    await client.get("/health")
+    await client.get("/entries/12345/content")
+
+    resp = await client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in text
+    # Route templates, not raw paths
+    assert 'route="/entries/{entry_id}/content"' in text
+    assert "/entries/12345" not in text
+    assert 'http_requests_in_flight{method="GET"} 1' in text
+
+    if "DATABASE_URL" in os.environ:
+        assert "db_pool_saturation" in text
+        assert "db_pool_checkout_wait_seconds_count" in text
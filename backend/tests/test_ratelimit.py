@@ -0,0 +1,124 @@
+import os
+import pytest
+from fastapi import HTTPException
+
+from app import ratelimit
+from app.main import app
+from app.ratelimit import (
+    Bucket,
+    MemoryLimitStore,
+    RateLimited,
+    SqliteLimitStore,
+    SynthesisLimiter,
+)
+
+
+@pytest.mark.asyncio
+async def test_take_is_all_or_nothing():
+    store = MemoryLimitStore()
+    requests = Bucket("requests:1", 1, 10, 10 / 60)
+    chars = Bucket("chars:1", 80, 100, 100 / 60)
+
+    assert await store.take([requests, chars]) == 0
+    # The chars bucket is short, so the requests bucket is not charged either
+    wait = await store.take([requests, chars])
+    assert 30 < wait <= 36
+    assert await store.take([Bucket("requests:1", 9, 10, 10 / 60)]) == 0
+
+
+@pytest.mark.asyncio
+async def test_sqlite_limits_are_shared_between_instances(tmp_path):
+    path = tmp_path / "ratelimit.sqlite3"
+    first, second = SqliteLimitStore(path), SqliteLimitStore(path)
+    bucket = Bucket("requests:1", 1, 2, 2 / 60)
+
+    assert await first.take([bucket]) == 0
+    assert await second.take([bucket]) == 0
+    assert await first.take([bucket]) > 0
+
+    slot = await first.acquire("concurrent:1", 1, 60)
+    assert await second.acquire("concurrent:1", 1, 60) is None
+    await second.release("concurrent:1", slot)
+    assert await first.acquire("concurrent:1", 1, 60) is not None
+    # Slots of a dead holder expire
+    assert await first.acquire("concurrent:2", 1, 0) is not None
+    assert await second.acquire("concurrent:2", 1, 60) is not None
+
+
+@pytest.mark.asyncio
+async def test_concurrency_slot_is_released():
+    limiter = SynthesisLimiter(MemoryLimitStore(), 0, 0, 1, 60)
+    async with limiter.slot(1, 10):
+        with pytest.raises(RateLimited) as exc:
+            await limiter.admit(1, 10)
+        assert exc.value.limit == "concurrency"
+    await limiter.release(1, await limiter.admit(1, 10))
+
+
+@pytest.mark.asyncio
+async def test_synthesis_over_quota_is_429(client, auth_header, monkeypatch):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping synthesis tests")
+
+    headers, user = auth_header
+    monkeypatch.setattr(
+        app.state, "rate_limiter", SynthesisLimiter(MemoryLimitStore(), 2, 0, 0, 60)
+    )
+    body = {"text": "Rate limited", "voice": "ar-EG-SalmaNeural"}
+
+    for _ in range(2):
+        resp = await client.post("/synthesis/GET", headers=headers, json=body)
+        assert resp.status_code == 200
+    resp = await client.post("/synthesis/GET", headers=headers, json=body)
+    assert resp.status_code == 429
+    assert int(resp.headers["retry-after"]) == 30
+
+    resp = await client.post("/synthesis/GET", json=body)
+    assert resp.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_synthesis_holds_no_connection(client, auth_header, monkeypatch):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping synthesis tests")
+
+    from app.controllers import TTSController
+    from app.userCache import user_cache
+
+    headers, user = auth_header
+    pool = app.state.engine.pool
+    held = []
+    speak = TTSController.speak
+
+    async def watched(*args, **kwargs):
+        held.append(pool.checkedout())
+        return await speak(*args, **kwargs)
+
+    monkeypatch.setattr(TTSController, "speak", watched)
+    # A cache miss looks the user up, and must give the connection back
+    user_cache.clear()
+    # The fixtures' own session may hold one
+    idle = pool.checkedout()
+    body = {"text": "No connection held", "voice": "ar-EG-SalmaNeural"}
+    resp = await client.post("/synthesis/GET", headers=headers, json=body)
+    assert resp.status_code == 200
+    assert held == [idle]
+
+
+@pytest.mark.asyncio
+async def test_text_over_the_chars_quota_is_refused():
+    limiter = SynthesisLimiter(MemoryLimitStore(), 0, 100, 1, 60)
+    with pytest.raises(HTTPException) as exc:
+        await limiter.admit(1, 101)
+    assert exc.value.status_code == 413
+    # Its slot went back, and nothing was charged
+    await limiter.release(1, await limiter.admit(1, 100))
+    with pytest.raises(RateLimited) as limited:
+        await limiter.charge(1, 1)
+    assert limited.value.retry_after > 0.5
+
+
+def test_unknown_backend_is_refused(monkeypatch):
+    monkeypatch.setattr(ratelimit, "RATE_LIMIT_BACKEND", "reddis")
+    with pytest.raises(ValueError):
+        ratelimit.create_rate_limiter()
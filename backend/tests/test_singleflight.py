@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+
+from app.controllers import TTSController
+from app.tts.blobs import LocalBlobStore
+from app.tts.cache import AudioCache
+from app.tts.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_render(tmp_path, monkeypatch):
+    renders = 0
+
+    async def fake_render(text, voice, rate):
+        nonlocal renders
+        renders += 1
+        await asyncio.sleep(0.05)
+        return b"\xff\xfb" + text.encode()
+
+    monkeypatch.setattr(TTSController, "render", fake_render)
+    cache = AudioCache(LocalBlobStore(tmp_path), max_bytes=1024)
+
+    results = await asyncio.gather(
+        *(TTSController.speak("Same text", "voice", cache) for _ in range(10))
+    )
+
+    assert renders == 1
+    assert len({key for key, _ in results}) == 1
+    assert TTSController.flights.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_share_the_error():
+    flights = SingleFlight()
+    calls = 0
+
+    async def boom():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        *(flights.do("key", boom) for _ in range(3)), return_exceptions=True
+    )
+
+    assert calls == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert flights.shared == 2
+
+
+@pytest.mark.asyncio
+async def test_first_caller_cancel_does_not_cancel_the_work():
+    flights = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return b"audio"
+
+    first = asyncio.create_task(flights.do("key", slow))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(flights.do("key", slow))
+    await asyncio.sleep(0.01)
+
+    first.cancel()
+
+    assert await second == b"audio"
+    assert first.cancelled()
@@ -21,3 +21,100 @@ async def test_synthesis(client, auth_header):
     assert resp.headers["content-type"] == "audio/mpeg"
     assert len(resp.content) > 0
     assert resp.content[0] == 0xFF  # Valid MP3 starts with 0xFF
+    first = resp.content
+
+    # Same text and voice again is served from the audio cache
+    resp = await client.post(
+        "/synthesis/GET",
+        headers=headers,
+        json={"text": f"  {text} ", "voice": voice},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["x-cache"] == "HIT"
+    assert resp.content == first
+
+    resp = await client.get("/synthesis/cache/stats")
+    assert resp.status_code == 200
+    assert resp.json()["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_synthesis_stream(client, auth_header):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping synthesis tests")
+
+    headers, user = auth_header
+
+    async with client.stream(
+        "POST",
+        "/synthesis/stream",
+        headers=headers,
+        json={"text": "Streaming test", "voice": "ar-EG-SalmaNeural"},
+    ) as resp:
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] == "audio/mpeg"
+        audio = b"".join([chunk async for chunk in resp.aiter_bytes()])
+
+    assert len(audio) > 0
+    assert audio[0] == 0xFF
+
+
+@pytest.mark.asyncio
+async def test_synthesis_audio_ranges(client, auth_header):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping synthesis tests")
+
+    headers, user = auth_header
+    resp = await client.post(
+        "/synthesis/GET",
+        headers=headers,
+        json={"text": "Seek through me", "voice": "ar-EG-SalmaNeural"},
+    )
+    assert resp.headers["accept-ranges"] == "bytes"
+    audio = resp.content
+    location = resp.headers["content-location"]
+
+    resp = await client.get(location, headers={"Range": "bytes=100-199"})
+    assert resp.status_code == 206
+    assert resp.headers["content-range"] == f"bytes 100-199/{len(audio)}"
+    assert resp.content == audio[100:200]
+
+    resp = await client.get(location, headers={"Range": f"bytes={len(audio)}-"})
+    assert resp.status_code == 416
+
+    resp = await client.get("/synthesis/audio/" + "0" * 64)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_synthesis_hit_evicted_before_sending(client, auth_header, monkeypatch):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping synthesis tests")
+
+    from app.controllers import TTSController
+    from app.main import app
+
+    headers, user = auth_header
+    body = {"text": "Evicted right after the hit", "voice": "ar-EG-SalmaNeural"}
+    resp = await client.post("/synthesis/GET", headers=headers, json=body)
+    assert resp.status_code == 200
+
+    cache = app.state.audio_cache
+    speak = TTSController.speak
+    hits = []
+
+    async def evicting(*args, **kwargs):
+        key, hit = await speak(*args, **kwargs)
+        hits.append(hit)
+        if hit:
+            # Another worker's eviction, between the lookup and the response
+            cache.store.delete(key)
+        return key, hit
+
+    monkeypatch.setattr(TTSController, "speak", evicting)
+    resp = await client.post("/synthesis/GET", headers=headers, json=body)
+    assert resp.status_code == 200
+    assert resp.headers["x-cache"] == "MISS"
+    assert resp.content[0] == 0xFF
+    assert hits == [True, False]
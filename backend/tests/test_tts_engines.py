@@ -0,0 +1,42 @@
+import time
+import pytest
+
+from app.tts.engines import MP3_FRAME, LocalTTSEngine
+
+
+async def collect(engine, text, rate="+0%"):
+    return b"".join([chunk async for chunk in engine.stream(text, "voice", rate)])
+
+
+@pytest.mark.asyncio
+async def test_local_engine_returns_mp3_frames():
+    engine = LocalTTSEngine(latency=0, bytes_per_second=0, chars_per_second=15)
+
+    audio = await collect(engine, "Hello world")
+
+    assert audio[:2] == b"\xff\xf3"
+    assert len(audio) % len(MP3_FRAME) == 0
+    assert audio == await collect(engine, "Hello world")
+
+
+@pytest.mark.asyncio
+async def test_local_engine_length_follows_text_and_rate():
+    engine = LocalTTSEngine(latency=0, bytes_per_second=0, chars_per_second=15)
+
+    short = await collect(engine, "a" * 30)
+    long = await collect(engine, "a" * 300)
+    fast = await collect(engine, "a" * 300, rate="+100%")
+
+    assert len(long) > len(short)
+    assert len(fast) < len(long)
+
+
+@pytest.mark.asyncio
+async def test_local_engine_latency_and_throughput():
+    engine = LocalTTSEngine(latency=0.05, bytes_per_second=100_000, chars_per_second=15)
+
+    started = time.perf_counter()
+    audio = await collect(engine, "a" * 300)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed >= 0.05 + len(audio) / 100_000 * 0.9
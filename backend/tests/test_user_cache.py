@@ -0,0 +1,64 @@
+import os, pytest
+from sqlalchemy import delete
+
+from app.models.user import Users
+from app.security import create_access_token
+from app.userCache import CurrentUser, UserCache, user_cache
+
+
+def test_user_cache_ttl_and_size():
+    cache = UserCache(max_size=2, ttl=60)
+    alice, bob, carol = (CurrentUser(i, f"user-{i}") for i in (1, 2, 3))
+
+    assert cache.get(1, "t1") is None
+    cache.put(1, "t1", alice)
+    cache.put(2, "t2", bob)
+    assert cache.get(1, "t1") is alice
+
+    cache.put(3, "t3", carol)
+    assert cache.get(2, "t2") is None
+    assert cache.get(1, "t1") is alice
+
+    expired = UserCache(max_size=2, ttl=-1)
+    expired.put(1, "t1", alice)
+    assert expired.get(1, "t1") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_user_is_invalidated_on_delete(client, db_session, user_cleanup):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping user cache tests")
+
+    username = "cached-user"
+    user_cleanup(username)
+    user = Users(username=username, hashed_password="irrelevant")
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+    headers = {"Authorization": f"Bearer {create_access_token(user.id, username)}"}
+
+    resp = await client.get("/auth/me", headers=headers)
+    assert resp.status_code == 200
+    hits = user_cache.hits
+
+    resp = await client.get("/auth/me", headers=headers)
+    assert resp.status_code == 200
+    assert user_cache.hits == hits + 1
+    # A detached snapshot, not an ORM row tied to the session that loaded it
+    assert user_cache.get(user.id, headers["Authorization"][7:]) == CurrentUser(
+        user.id, username
+    )
+
+    await db_session.execute(delete(Users).where(Users.id == user.id))
+    await db_session.commit()
+
+    resp = await client.get("/auth/me", headers=headers)
+    assert resp.status_code == 404
+
+    resp = await client.get("/auth/cache/stats")
+    assert resp.status_code == 200
+    assert resp.json()["hits"] >= 1
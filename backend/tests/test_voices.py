@@ -0,0 +1,83 @@
+import asyncio
+import os
+import pytest
+
+from app.tts.voices import Voice, VoiceCatalog, VoicesUnavailable
+
+SALMA = Voice("ar-EG-SalmaNeural", "ar-EG", "Female", "Salma")
+SHAKIR = Voice("ar-EG-ShakirNeural", "ar-EG", "Male", "Shakir")
+
+
+class Upstream:
+    def __init__(self, *voices):
+        self.voices = list(voices)
+        self.calls = 0
+        self.fail = False
+
+    async def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("upstream down")
+        return list(self.voices)
+
+
+@pytest.mark.asyncio
+async def test_catalog_serves_stale_while_refreshing():
+    upstream = Upstream(SALMA)
+    catalog = VoiceCatalog(upstream, ttl=60, retry=60)
+
+    assert await catalog.get("ar-EG-SalmaNeural") == SALMA
+    assert await catalog.get("ar-EG-ShakirNeural") is None
+    assert upstream.calls == 1
+
+    # Expired: the old list answers at once, the new one lands in the background
+    upstream.voices.append(SHAKIR)
+    catalog._expires = 0
+    assert await catalog.get("ar-EG-ShakirNeural") is None
+    await catalog._task
+    assert await catalog.get("ar-EG-ShakirNeural") == SHAKIR
+    assert upstream.calls == 2
+
+    # A failed refresh keeps the list and is not retried at once
+    upstream.fail = True
+    catalog._expires = 0
+    await catalog.get("ar-EG-SalmaNeural")
+    await catalog._task
+    assert await catalog.voices("AR-eg", "male") == [SHAKIR]
+    assert upstream.calls == 3
+    await catalog.close()
+
+
+@pytest.mark.asyncio
+async def test_catalog_first_load_is_shared():
+    upstream = Upstream(SALMA)
+    catalog = VoiceCatalog(upstream, ttl=60, retry=60)
+    found = await asyncio.gather(*(catalog.get(SALMA.name) for _ in range(10)))
+    assert found == [SALMA] * 10
+    assert upstream.calls == 1
+
+    upstream.fail = True
+    empty = VoiceCatalog(upstream, ttl=60, retry=60)
+    with pytest.raises(VoicesUnavailable):
+        await empty.voices()
+
+
+@pytest.mark.asyncio
+async def test_voices_endpoint_and_validation(client, auth_header):
+    if "DATABASE_URL" not in os.environ:
+        pytest.skip("DATABASE_URL not set; skipping synthesis tests")
+
+    resp = await client.get(
+        "/synthesis/voices", params={"locale": "ar-EG", "gender": "Female"}
+    )
+    assert resp.status_code == 200
+    assert [v["name"] for v in resp.json()["voices"]] == ["ar-EG-SalmaNeural"]
+
+    headers, user = auth_header
+    resp = await client.post(
+        "/synthesis/GET",
+        headers=headers,
+        json={"text": "Never rendered", "voice": "xx-XX-NobodyNeural"},
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"] == "Unknown voice: xx-XX-NobodyNeural"
@@ -26,6 +26,8 @@ import {
 } from "@heroui/react"
 import { TrashIcon } from "@heroicons/react/24/solid"
 
+const PAGE_SIZE = 50
+
 type Entry = {
   id: number
   title: string
@@ -56,6 +58,7 @@ const Home = () => {
   const [textContent, setTextContent] = useState("")
 
   const [entries, setEntries] = useState<Entry[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
 
   const [isLoading, setIsLoading] = useState(true)
   const [hasError, setHasError] = useState(false)
@@ -150,14 +153,17 @@ const Home = () => {
     }
   }
 
-  const getUserEntries = async () => {
+  // One page at a time: the first on load, the next when asked for
+  const getUserEntries = async (cursor: string | null = null) => {
     try {
       setIsLoading(true)
       setHasError(false)
-      const url = `${env.VITE_API_URL}/entries/list/me`
       const headers = {
         Authorization: `Bearer ${token}`
       }
+      const params = new URLSearchParams({ limit: String(PAGE_SIZE) })
+      if (cursor) params.set("cursor", cursor)
+      const url = `${env.VITE_API_URL}/entries/list/me?${params}`
       const resp = await fetch(url, { headers })
 
       if (!resp.ok) {
@@ -167,14 +173,16 @@ const Home = () => {
       }
 
       const data = await resp.json()
-      data.entries.forEach((entry: Entry) => {
+      const page: Entry[] = data.entries
+      page.forEach((entry: Entry) => {
         entry.date = new Date(entry.date).toLocaleString(undefined, {
           year: "numeric",
           month: "short",
           day: "numeric"
         })
       })
-      setEntries(data.entries)
+      setEntries(previous => (cursor ? [...previous, ...page] : page))
+      setNextCursor(data.next_cursor ?? null)
     } catch (err) {
       setHasError(true)
       console.error(err)
@@ -251,6 +259,19 @@ const Home = () => {
         className="w-full"
         color="default"
         selectionMode="single"
+        bottomContent={
+          nextCursor ? (
+            <div className="flex w-full justify-center">
+              <Button
+                variant="flat"
+                isDisabled={isLoading}
+                onPress={() => getUserEntries(nextCursor)}
+              >
+                Load more
+              </Button>
+            </div>
+          ) : null
+        }
       >
         <TableHeader columns={columns}>
           {column => (
@@ -269,7 +269,7 @@ const Player = () => {
       const url = `${env.VITE_API_URL}/synthesis/GET`
       const method = "POST"
       const headers = {
-        Authentication: `Bearer ${token}`,
+        Authorization: `Bearer ${token}`,
         "Content-Type": "application/json"
       }
 
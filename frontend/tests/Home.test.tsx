@@ -156,4 +156,56 @@ describe("Entries", () => {
       })
     )
   })
+
+  it("should load the next page only when asked", async () => {
+    const { userEvent } = await import("@testing-library/user-event")
+    const { waitFor } = await import("@testing-library/react")
+
+    global.fetch = vi
+      .fn()
+      .mockResolvedValueOnce({
+        ok: true,
+        json: () =>
+          Promise.resolve({
+            entries: [{ id: 1, title: "first page" }],
+            next_cursor: "abc"
+          })
+      })
+      .mockResolvedValueOnce({
+        ok: true,
+        json: () =>
+          Promise.resolve({
+            entries: [{ id: 2, title: "second page" }],
+            next_cursor: null
+          })
+      }) as any
+
+    const testStore = configureStore({
+      reducer: { user: authReducer, darkMode: themeModeSlice },
+      preloadedState: {
+        user: { isLoggedIn: true, userId: 1, username: "testuser" }
+      }
+    })
+
+    render(<Home />, { store: testStore })
+
+    await waitFor(() => {
+      expect(screen.getByText("first page")).toBeInTheDocument()
+    })
+    expect(global.fetch).toHaveBeenCalledTimes(1)
+
+    await userEvent.click(screen.getByRole("button", { name: /Load more/i }))
+
+    await waitFor(() => {
+      expect(screen.getByText("second page")).toBeInTheDocument()
+    })
+    expect(screen.getByText("first page")).toBeInTheDocument()
+    expect(global.fetch).toHaveBeenLastCalledWith(
+      expect.stringContaining("cursor=abc"),
+      expect.anything()
+    )
+    expect(
+      screen.queryByRole("button", { name: /Load more/i })
+    ).not.toBeInTheDocument()
+  })
 })